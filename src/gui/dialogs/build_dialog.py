@@ -221,7 +221,7 @@ class BuildDialog(QDialog):
         options_layout.addWidget(self.console_check)
         
         self.clean_check = QCheckBox("Alte Build-Dateien löschen")
-        self.clean_check.setChecked(True)
+        self.clean_check.setChecked(False)  # inkrementell; nur für Release-Builds aktivieren
         options_layout.addWidget(self.clean_check)
         
         layout.addWidget(options_group)
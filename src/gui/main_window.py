@@ -6,15 +6,18 @@ Hauptfenster der Anwendung mit vollständiger Panel-Integration
 
 import sys
 import os
+from functools import cached_property, partial
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Set, TYPE_CHECKING
 
 from PySide6.QtWidgets import (
     QMainWindow, QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QMenuBar, QMenu, QToolBar, QStatusBar, QSplitter,
-    QLabel, QPushButton, QMessageBox, QFileDialog, QDockWidget
+    QLabel, QPushButton, QMessageBox, QFileDialog, QDockWidget, QStackedWidget
+)
+from PySide6.QtCore import (
+    Qt, QTimer, QSize, Signal, QSettings, QByteArray, QRunnable, QThread, QThreadPool
 )
-from PySide6.QtCore import Qt, QTimer, QSize, Signal
 from PySide6.QtGui import QAction, QFont, QKeySequence, QIcon
 
 # Lokale Imports
@@ -23,17 +26,123 @@ from core.project_manager import ProjectManager, ProjectConfig
 from core.settings_manager import SettingsManager, get_settings
 from core.event_bus import EventBus, EventType, get_event_bus
 from modules.editor.code_editor import CodeEditor
-from modules.analyzer import MethodAnalyzer, AnalysisResult
-from modules.ai_assistant import AIService
 
 # GUI Imports
 from gui.panels.explorer_panel import ExplorerPanel
 from gui.panels.output_panel import OutputPanel
 from gui.panels.problems_panel import ProblemsPanel, Problem, ProblemSeverity
 from gui.panels.ai_panel import AIAssistantPanel
-from gui.dialogs.new_project_dialog import NewProjectDialog
-from gui.dialogs.settings_dialog import SettingsDialog
-from gui.dialogs.build_dialog import BuildDialog
+
+# Analyzer, AI-Service und Dialoge werden erst bei Bedarf importiert
+if TYPE_CHECKING:
+    from modules.analyzer import MethodAnalyzer, AnalysisResult
+    from modules.ai_assistant import AIService
+
+
+# Tastenkürzel werden einmal geparst und danach wiederverwendet
+_SHORTCUTS: Dict[str, QKeySequence] = {}
+
+
+def _shortcut(key: str) -> QKeySequence:
+    """Gibt eine gecachte QKeySequence für den Kürzel-String zurück"""
+    sequence = _SHORTCUTS.get(key)
+    if sequence is None:
+        sequence = _SHORTCUTS[key] = QKeySequence(key)
+    return sequence
+
+
+# Menüleiste: (Titel, Einträge); Eintrag = (Text, Kürzel, Slot, checked) oder None für Trenner.
+# checked=None bedeutet nicht umschaltbar.
+_MENU_SPEC = (
+    ("&Datei", (
+        ("Neues Projekt...", "Ctrl+Shift+N", "_new_project", None),
+        ("Projekt öffnen...", "Ctrl+Shift+O", "_open_project", None),
+        None,
+        ("Neue Datei", "Ctrl+N", "_new_file", None),
+        ("Datei öffnen...", "Ctrl+O", "_open_file", None),
+        None,
+        ("Speichern", "Ctrl+S", "_save_file", None),
+        ("Speichern unter...", "Ctrl+Shift+S", "_save_file_as", None),
+        None,
+        ("Einstellungen...", "Ctrl+,", "_show_settings", None),
+        None,
+        ("Beenden", "Alt+F4", "close", None),
+    )),
+    ("&Bearbeiten", (
+        ("Rückgängig", "Ctrl+Z", "_undo", None),
+        ("Wiederholen", "Ctrl+Y", "_redo", None),
+        None,
+        ("Ausschneiden", "Ctrl+X", "_cut", None),
+        ("Kopieren", "Ctrl+C", "_copy", None),
+        ("Einfügen", "Ctrl+V", "_paste", None),
+        None,
+        ("Suchen...", "Ctrl+F", "_find", None),
+        ("Ersetzen...", "Ctrl+H", "_replace", None),
+    )),
+    ("&Ansicht", (
+        ("Explorer", None, "_toggle_explorer", True),
+        ("Ausgabe", None, "_toggle_output", True),
+        ("AI-Assistent", "Ctrl+Shift+A", "_toggle_ai_panel", False),
+    )),
+    ("&Ausführen", (
+        ("▶ Ausführen", "F5", "_run_current", None),
+        None,
+        ("🔨 Build erstellen...", "F6", "_show_build_dialog", None),
+    )),
+    ("&Analyse", (
+        ("📊 Aktuelle Datei analysieren", "Ctrl+Alt+A", "_analyze_current_file", None),
+        ("📊 Projekt analysieren", None, "_analyze_project", None),
+    )),
+    ("&Hilfe", (
+        ("Über DevCenter", None, "_show_about", None),
+    )),
+)
+
+
+class _PathExistsCheck(QRunnable):
+    """Prüft im Thread-Pool ob ein Pfad existiert (blockiert bei Netzlaufwerken)"""
+    
+    def __init__(self, path: str, result_signal):
+        super().__init__()
+        self.path = path
+        self.result_signal = result_signal
+    
+    def run(self):
+        self.result_signal.emit(self.path, os.path.exists(self.path))
+
+
+class AnalyzerWorker(QThread):
+    """Analysiert alle Python-Dateien eines Projekts im Hintergrund"""
+    
+    file_analyzed = Signal(str, object)  # path, AnalysisResult
+    finished_all = Signal(int)  # Anzahl analysierter Dateien
+    
+    def __init__(self, root: str, parent=None):
+        super().__init__(parent)
+        self.root = root
+    
+    def run(self):
+        """Liefert die Ergebnisse Datei für Datei per Signal aus."""
+        count = 0
+        try:
+            from modules.analyzer import MethodAnalyzer
+            analyzer = MethodAnalyzer()  # eigene Instanz, kein geteilter Zustand
+            
+            # Ab PARALLEL_MIN_FILES Dateien im Prozess-Pool des Analyzers
+            results = analyzer.iter_directory(self.root)
+            try:
+                for path, result in results:
+                    if self.isInterruptionRequested():
+                        break
+                    self.file_analyzed.emit(path, result)
+                    count += 1
+            finally:
+                results.close()  # verwirft ausstehende Aufträge bei Abbruch
+        except Exception as e:
+            print(f"Fehler bei der Projektanalyse: {e}")
+        finally:
+            # Immer melden, damit die Oberfläche nicht auf die Analyse wartet
+            self.finished_all.emit(count)
 
 
 class MainWindow(QMainWindow):
@@ -57,6 +166,9 @@ class MainWindow(QMainWindow):
     └─────────────────────────────────────────────────────────────┘
     """
     
+    # Ergebnis der Hintergrund-Prüfung der Projekt-Hauptdatei (path, exists)
+    _main_file_checked = Signal(str, bool)
+    
     def __init__(self):
         super().__init__()
         
@@ -64,12 +176,13 @@ class MainWindow(QMainWindow):
         self.settings = get_settings()
         self.project_manager = ProjectManager()
         self.event_bus = get_event_bus()
-        self.analyzer = MethodAnalyzer()
-        self.ai_service = AIService(self.settings.get('ai.api_key', ''))
         
         # Aktives Projekt
         self.current_project: Optional[ProjectConfig] = None
         self.open_files: Dict[str, CodeEditor] = {}
+        self._editor_index: Dict[CodeEditor, int] = {}
+        self._dirty_editors: Set[CodeEditor] = set()  # per file_modified gepflegt
+        self._analyzer_worker: Optional[AnalyzerWorker] = None
         
         # UI Setup
         self.setWindowTitle("DevCenter")
@@ -86,6 +199,18 @@ class MainWindow(QMainWindow):
         # Welcome oder letztes Projekt
         self._show_welcome()
     
+    @cached_property
+    def analyzer(self) -> 'MethodAnalyzer':
+        """Code-Analyzer, wird beim ersten Zugriff erstellt"""
+        from modules.analyzer import MethodAnalyzer
+        return MethodAnalyzer()
+    
+    @cached_property
+    def ai_service(self) -> 'AIService':
+        """AI-Service, wird beim ersten Zugriff erstellt"""
+        from modules.ai_assistant import AIService
+        return AIService(self.settings.get('ai.api_key', ''))
+    
     def _apply_dark_theme(self):
         """Wendet das dunkle Theme an"""
         self.setStyleSheet("""
@@ -194,12 +319,16 @@ class MainWindow(QMainWindow):
         center_layout.setContentsMargins(0, 0, 0, 0)
         center_layout.setSpacing(0)
         
+        # Editor-Bereich: Welcome-Screen und Editor-Tabs schließen sich aus
+        self.editor_stack = QStackedWidget()
+        center_layout.addWidget(self.editor_stack, stretch=3)
+        
         # Editor-Tabs
         self.editor_tabs = QTabWidget()
         self.editor_tabs.setTabsClosable(True)
         self.editor_tabs.setMovable(True)
         self.editor_tabs.setDocumentMode(True)
-        center_layout.addWidget(self.editor_tabs, stretch=3)
+        self.editor_tabs.tabBar().setExpanding(False)
         
         # Output-Splitter (vertikal)
         self.output_splitter = QSplitter(Qt.Orientation.Vertical)
@@ -222,7 +351,6 @@ class MainWindow(QMainWindow):
         self.ai_panel = AIAssistantPanel()
         self.ai_panel.setMinimumWidth(300)
         self.ai_panel.setMaximumWidth(500)
-        self.ai_panel.set_ai_service(self.ai_service)
         self.ai_panel.setVisible(False)  # Standardmäßig versteckt
         self.main_splitter.addWidget(self.ai_panel)
         
@@ -231,7 +359,8 @@ class MainWindow(QMainWindow):
         
         # Welcome-Widget für leeren Editor-Bereich
         self.welcome_widget = self._create_welcome_widget()
-        self.editor_tabs.addTab(self.welcome_widget, "🏠 Willkommen")
+        self.editor_stack.addWidget(self.welcome_widget)
+        self.editor_stack.addWidget(self.editor_tabs)
     
     def _create_welcome_widget(self) -> QWidget:
         """Erstellt den Willkommens-Bildschirm"""
@@ -254,19 +383,20 @@ class MainWindow(QMainWindow):
         actions_layout = QVBoxLayout()
         actions_layout.setSpacing(10)
         actions_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        button_style = self._get_welcome_button_style()
         
         new_project_btn = QPushButton("📁 Neues Projekt erstellen")
-        new_project_btn.setStyleSheet(self._get_welcome_button_style())
+        new_project_btn.setStyleSheet(button_style)
         new_project_btn.clicked.connect(self._new_project)
         actions_layout.addWidget(new_project_btn)
         
         open_project_btn = QPushButton("📂 Projekt öffnen")
-        open_project_btn.setStyleSheet(self._get_welcome_button_style())
+        open_project_btn.setStyleSheet(button_style)
         open_project_btn.clicked.connect(self._open_project)
         actions_layout.addWidget(open_project_btn)
         
         open_file_btn = QPushButton("📄 Datei öffnen")
-        open_file_btn.setStyleSheet(self._get_welcome_button_style())
+        open_file_btn.setStyleSheet(button_style)
         open_file_btn.clicked.connect(self._open_file)
         actions_layout.addWidget(open_file_btn)
         
@@ -278,24 +408,25 @@ class MainWindow(QMainWindow):
         recent_label.setStyleSheet("color: #888; font-size: 14px;")
         layout.addWidget(recent_label)
         
+        recent_style = """
+            QPushButton {
+                background: transparent;
+                color: #4ec9b0;
+                border: none;
+                text-align: left;
+                padding: 4px;
+            }
+            QPushButton:hover {
+                color: #007acc;
+                text-decoration: underline;
+            }
+        """
         recent_projects = self.project_manager.get_recent_projects()
         for project in recent_projects[:5]:
             btn = QPushButton(f"  📁 {project['name']}")
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: transparent;
-                    color: #4ec9b0;
-                    border: none;
-                    text-align: left;
-                    padding: 4px;
-                }
-                QPushButton:hover {
-                    color: #007acc;
-                    text-decoration: underline;
-                }
-            """)
+            btn.setStyleSheet(recent_style)
             btn.setProperty("project_path", project['path'])
-            btn.clicked.connect(lambda checked, p=project['path']: self._open_project_path(p))
+            btn.clicked.connect(partial(self._open_project_path, project['path']))
             layout.addWidget(btn)
         
         layout.addStretch()
@@ -322,161 +453,45 @@ class MainWindow(QMainWindow):
         """
     
     def _setup_menus(self):
-        """Erstellt die Menüleiste"""
+        """Erstellt die Menüleiste aus _MENU_SPEC"""
         menubar = self.menuBar()
-        
-        # === Datei-Menü ===
-        file_menu = menubar.addMenu("&Datei")
-        
-        new_project_action = QAction("Neues Projekt...", self)
-        new_project_action.setShortcut(QKeySequence("Ctrl+Shift+N"))
-        new_project_action.triggered.connect(self._new_project)
-        file_menu.addAction(new_project_action)
-        
-        open_project_action = QAction("Projekt öffnen...", self)
-        open_project_action.setShortcut(QKeySequence("Ctrl+Shift+O"))
-        open_project_action.triggered.connect(self._open_project)
-        file_menu.addAction(open_project_action)
-        
-        file_menu.addSeparator()
-        
-        new_file_action = QAction("Neue Datei", self)
-        new_file_action.setShortcut(QKeySequence("Ctrl+N"))
-        new_file_action.triggered.connect(self._new_file)
-        file_menu.addAction(new_file_action)
-        
-        open_file_action = QAction("Datei öffnen...", self)
-        open_file_action.setShortcut(QKeySequence("Ctrl+O"))
-        open_file_action.triggered.connect(self._open_file)
-        file_menu.addAction(open_file_action)
-        
-        file_menu.addSeparator()
-        
-        save_action = QAction("Speichern", self)
-        save_action.setShortcut(QKeySequence("Ctrl+S"))
-        save_action.triggered.connect(self._save_file)
-        file_menu.addAction(save_action)
-        
-        save_as_action = QAction("Speichern unter...", self)
-        save_as_action.setShortcut(QKeySequence("Ctrl+Shift+S"))
-        save_as_action.triggered.connect(self._save_file_as)
-        file_menu.addAction(save_as_action)
-        
-        file_menu.addSeparator()
-        
-        settings_action = QAction("Einstellungen...", self)
-        settings_action.setShortcut(QKeySequence("Ctrl+,"))
-        settings_action.triggered.connect(self._show_settings)
-        file_menu.addAction(settings_action)
-        
-        file_menu.addSeparator()
-        
-        exit_action = QAction("Beenden", self)
-        exit_action.setShortcut(QKeySequence("Alt+F4"))
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
-        
-        # === Bearbeiten-Menü ===
-        edit_menu = menubar.addMenu("&Bearbeiten")
-        
-        undo_action = QAction("Rückgängig", self)
-        undo_action.setShortcut(QKeySequence("Ctrl+Z"))
-        undo_action.triggered.connect(self._undo)
-        edit_menu.addAction(undo_action)
-        
-        redo_action = QAction("Wiederholen", self)
-        redo_action.setShortcut(QKeySequence("Ctrl+Y"))
-        redo_action.triggered.connect(self._redo)
-        edit_menu.addAction(redo_action)
-        
-        edit_menu.addSeparator()
-        
-        cut_action = QAction("Ausschneiden", self)
-        cut_action.setShortcut(QKeySequence("Ctrl+X"))
-        cut_action.triggered.connect(self._cut)
-        edit_menu.addAction(cut_action)
-        
-        copy_action = QAction("Kopieren", self)
-        copy_action.setShortcut(QKeySequence("Ctrl+C"))
-        copy_action.triggered.connect(self._copy)
-        edit_menu.addAction(copy_action)
-        
-        paste_action = QAction("Einfügen", self)
-        paste_action.setShortcut(QKeySequence("Ctrl+V"))
-        paste_action.triggered.connect(self._paste)
-        edit_menu.addAction(paste_action)
-        
-        edit_menu.addSeparator()
-        
-        find_action = QAction("Suchen...", self)
-        find_action.setShortcut(QKeySequence("Ctrl+F"))
-        find_action.triggered.connect(self._find)
-        edit_menu.addAction(find_action)
-        
-        replace_action = QAction("Ersetzen...", self)
-        replace_action.setShortcut(QKeySequence("Ctrl+H"))
-        replace_action.triggered.connect(self._replace)
-        edit_menu.addAction(replace_action)
-        
-        # === Ansicht-Menü ===
-        view_menu = menubar.addMenu("&Ansicht")
-        
-        self.toggle_explorer_action = QAction("Explorer", self)
-        self.toggle_explorer_action.setCheckable(True)
-        self.toggle_explorer_action.setChecked(True)
-        self.toggle_explorer_action.triggered.connect(self._toggle_explorer)
-        view_menu.addAction(self.toggle_explorer_action)
-        
-        self.toggle_output_action = QAction("Ausgabe", self)
-        self.toggle_output_action.setCheckable(True)
-        self.toggle_output_action.setChecked(True)
-        self.toggle_output_action.triggered.connect(self._toggle_output)
-        view_menu.addAction(self.toggle_output_action)
-        
-        self.toggle_ai_action = QAction("AI-Assistent", self)
-        self.toggle_ai_action.setCheckable(True)
-        self.toggle_ai_action.setChecked(False)
-        self.toggle_ai_action.setShortcut(QKeySequence("Ctrl+Shift+A"))
-        self.toggle_ai_action.triggered.connect(self._toggle_ai_panel)
-        view_menu.addAction(self.toggle_ai_action)
-        
-        # === Ausführen-Menü ===
-        run_menu = menubar.addMenu("&Ausführen")
-        
-        run_action = QAction("▶ Ausführen", self)
-        run_action.setShortcut(QKeySequence("F5"))
-        run_action.triggered.connect(self._run_current)
-        run_menu.addAction(run_action)
-        
-        run_menu.addSeparator()
-        
-        build_action = QAction("🔨 Build erstellen...", self)
-        build_action.setShortcut(QKeySequence("F6"))
-        build_action.triggered.connect(self._show_build_dialog)
-        run_menu.addAction(build_action)
-        
-        # === Analyse-Menü ===
-        analyze_menu = menubar.addMenu("&Analyse")
-        
-        analyze_file_action = QAction("📊 Aktuelle Datei analysieren", self)
-        analyze_file_action.setShortcut(QKeySequence("Ctrl+Shift+A"))
-        analyze_file_action.triggered.connect(self._analyze_current_file)
-        analyze_menu.addAction(analyze_file_action)
-        
-        analyze_project_action = QAction("📊 Projekt analysieren", self)
-        analyze_project_action.triggered.connect(self._analyze_project)
-        analyze_menu.addAction(analyze_project_action)
-        
-        # === Hilfe-Menü ===
-        help_menu = menubar.addMenu("&Hilfe")
-        
-        about_action = QAction("Über DevCenter", self)
-        about_action.triggered.connect(self._show_about)
-        help_menu.addAction(about_action)
+        actions: Dict[str, QAction] = {}
+        
+        for title, entries in _MENU_SPEC:
+            menu = menubar.addMenu(title)
+            menu_actions = []
+            for entry in entries:
+                if entry is None:
+                    menu_actions.append(self._separator())
+                    continue
+                
+                text, shortcut, slot, checked = entry
+                action = QAction(text, self)
+                if shortcut:
+                    action.setShortcut(_shortcut(shortcut))
+                if checked is not None:
+                    action.setCheckable(True)
+                    action.setChecked(checked)
+                action.triggered.connect(getattr(self, slot))
+                actions[slot] = action
+                menu_actions.append(action)
+            menu.addActions(menu_actions)
+        
+        # Umschalt-Aktionen werden von den Toggle-Slots gelesen
+        self.toggle_explorer_action = actions['_toggle_explorer']
+        self.toggle_output_action = actions['_toggle_output']
+        self.toggle_ai_action = actions['_toggle_ai_panel']
+    
+    def _separator(self) -> QAction:
+        """Erstellt eine Trenner-Aktion für QMenu.addActions()"""
+        action = QAction(self)
+        action.setSeparator(True)
+        return action
     
     def _setup_toolbar(self):
         """Erstellt die Toolbar"""
         toolbar = QToolBar("Hauptwerkzeugleiste")
+        toolbar.setObjectName("main_toolbar")  # für saveState()/restoreState()
         toolbar.setMovable(False)
         toolbar.setIconSize(QSize(20, 20))
         self.addToolBar(toolbar)
@@ -533,6 +548,7 @@ class MainWindow(QMainWindow):
         
         # Editor Tabs
         self.editor_tabs.tabCloseRequested.connect(self._close_tab)
+        self.editor_tabs.tabBar().tabMoved.connect(self._remap_indices)
         self.editor_tabs.currentChanged.connect(self._on_tab_changed)
         
         # Problems Panel
@@ -541,18 +557,31 @@ class MainWindow(QMainWindow):
         # AI Panel
         self.ai_panel.code_generated.connect(self._on_code_generated)
         
+        # Hintergrund-Prüfungen
+        self._main_file_checked.connect(self._on_main_file_checked)
+        
         # Event Bus
         self.event_bus.subscribe(EventType.STATUS_MESSAGE, self._on_status_message)
     
+    def _window_settings(self) -> QSettings:
+        """QSettings-Speicher für den binären Fensterzustand"""
+        return QSettings("DevCenter", "DevCenter")
+    
     def _restore_state(self):
         """Stellt den Fensterzustand wieder her"""
-        state = self.settings.get('window.state', {})
+        qs = self._window_settings()
+        
+        geometry = qs.value("window/geometry", type=QByteArray)
+        if geometry:
+            self.restoreGeometry(geometry)
         
-        if 'geometry' in state:
-            pass  # TODO: Geometrie wiederherstellen
+        state = qs.value("window/state", type=QByteArray)
+        if state:
+            self.restoreState(state)
         
-        if 'maximized' in state and state['maximized']:
-            self.showMaximized()
+        splitter = qs.value("window/splitter", type=QByteArray)
+        if splitter:
+            self.main_splitter.restoreState(splitter)
     
     def _show_welcome(self):
         """Zeigt Welcome-Screen oder öffnet letztes Projekt"""
@@ -566,6 +595,8 @@ class MainWindow(QMainWindow):
     
     def _new_project(self):
         """Erstellt ein neues Projekt"""
+        from gui.dialogs.new_project_dialog import NewProjectDialog
+        
         dialog = NewProjectDialog(self)
         if dialog.exec():
             name, path, description = dialog.get_project_info()
@@ -581,8 +612,8 @@ class MainWindow(QMainWindow):
         if path:
             self._open_project_path(path)
     
-    def _open_project_path(self, path: str):
-        """Öffnet ein Projekt von einem Pfad"""
+    def _open_project_path(self, path: str, checked: bool = False):
+        """Öffnet ein Projekt von einem Pfad (checked: ignoriertes clicked-Argument)"""
         project = self.project_manager.open_project(path)
         if project:
             self._load_project(project)
@@ -596,27 +627,47 @@ class MainWindow(QMainWindow):
         self.project_label.setText(f"📁 {project.name}")
         self.setWindowTitle(f"DevCenter - {project.name}")
         
-        # Hauptdatei öffnen wenn vorhanden
+        # Hauptdatei öffnen wenn vorhanden (stat() läuft im Thread-Pool)
         if project.main_file:
             main_path = os.path.join(project.path, project.main_file)
-            if os.path.exists(main_path):
-                self._open_file_path(main_path)
+            QThreadPool.globalInstance().start(
+                _PathExistsCheck(main_path, self._main_file_checked)
+            )
+    
+    def _on_main_file_checked(self, path: str, exists: bool):
+        """Öffnet die Hauptdatei, sofern das Projekt inzwischen nicht gewechselt wurde"""
+        if not exists or not self.current_project:
+            return
+        main_path = os.path.join(self.current_project.path, self.current_project.main_file or "")
+        if main_path == path:
+            self._open_file_path(path)
     
     def _new_file(self):
         """Erstellt eine neue leere Datei"""
         editor = CodeEditor()
-        self.editor_tabs.addTab(editor, "Unbenannt")
+        self._editor_index[editor] = self.editor_tabs.addTab(editor, "Unbenannt")
         self.editor_tabs.setCurrentWidget(editor)
+        self._update_editor_stack()
         self._connect_editor(editor)
     
     def _open_file(self):
-        """Öffnet eine Datei via Dialog"""
-        path, _ = QFileDialog.getOpenFileName(
+        """Öffnet eine oder mehrere Dateien via Dialog"""
+        paths, _ = QFileDialog.getOpenFileNames(
             self, "Datei öffnen",
             filter="Python-Dateien (*.py *.pyw);;Alle Dateien (*.*)"
         )
-        if path:
-            self._open_file_path(path)
+        if paths:
+            self._open_file_paths(paths)
+    
+    def _open_file_paths(self, paths):
+        """Öffnet mehrere Dateien mit nur einem Neuzeichnen der Tab-Leiste"""
+        self.editor_tabs.setUpdatesEnabled(False)
+        try:
+            for path in paths:
+                self._open_file_path(path)
+        finally:
+            self.editor_tabs.setUpdatesEnabled(True)
+            self.editor_tabs.update()
     
     def _open_file_path(self, path: str):
         """Öffnet eine Datei von einem Pfad"""
@@ -632,7 +683,9 @@ class MainWindow(QMainWindow):
             self.open_files[path] = editor
             name = os.path.basename(path)
             index = self.editor_tabs.addTab(editor, name)
+            self._editor_index[editor] = index
             self.editor_tabs.setCurrentIndex(index)
+            self._update_editor_stack()
             self._connect_editor(editor)
         else:
             QMessageBox.warning(self, "Fehler", f"Datei konnte nicht geöffnet werden:\n{path}")
@@ -674,7 +727,7 @@ class MainWindow(QMainWindow):
         """Schließt einen Tab"""
         widget = self.editor_tabs.widget(index)
         
-        if isinstance(widget, CodeEditor):
+        if widget in self._editor_index:
             if widget.is_modified():
                 reply = QMessageBox.question(
                     self, "Ungespeicherte Änderungen",
@@ -692,19 +745,35 @@ class MainWindow(QMainWindow):
             # Aus open_files entfernen
             if widget.file_path in self.open_files:
                 del self.open_files[widget.file_path]
+            self._dirty_editors.discard(widget)
         
         self.editor_tabs.removeTab(index)
+        self._remap_indices()
+        self._update_editor_stack()
+    
+    def _update_editor_stack(self):
+        """Zeigt den Welcome-Screen, solange kein Editor-Tab offen ist"""
+        if self.editor_tabs.count():
+            self.editor_stack.setCurrentWidget(self.editor_tabs)
+        else:
+            self.editor_stack.setCurrentWidget(self.welcome_widget)
+    
+    def _remap_indices(self, *args):
+        """Baut die Zuordnung Editor -> Tab-Index neu auf (nach Verschieben/Schließen)"""
+        self._editor_index = {
+            self.editor_tabs.widget(i): i for i in range(self.editor_tabs.count())
+        }
     
     def _get_current_editor(self) -> Optional[CodeEditor]:
         """Gibt den aktuellen Editor zurück"""
         widget = self.editor_tabs.currentWidget()
-        if isinstance(widget, CodeEditor):
+        if widget in self._editor_index:
             return widget
         return None
     
     def _update_tab_title(self, editor: CodeEditor):
         """Aktualisiert den Tab-Titel"""
-        index = self.editor_tabs.indexOf(editor)
+        index = self._editor_index.get(editor, -1)
         if index >= 0:
             name = os.path.basename(editor.file_path) if editor.file_path else "Unbenannt"
             if editor.is_modified():
@@ -713,10 +782,14 @@ class MainWindow(QMainWindow):
     
     # === Editor-Callbacks ===
     
-    def _on_file_modified(self):
+    def _on_file_modified(self, modified: bool):
         """Wird aufgerufen wenn Datei geändert wurde"""
         editor = self.sender()
-        if isinstance(editor, CodeEditor):
+        if modified:
+            self._dirty_editors.add(editor)
+        else:
+            self._dirty_editors.discard(editor)
+        if editor in self._editor_index:
             self._update_tab_title(editor)
     
     def _on_cursor_changed(self, line: int, column: int):
@@ -725,9 +798,14 @@ class MainWindow(QMainWindow):
     
     def _on_tab_changed(self, index: int):
         """Wird aufgerufen wenn Tab gewechselt wird"""
+        # Kontext nur bei sichtbarem AI-Panel aktualisieren
+        if self.ai_panel.isVisible():
+            self._push_ai_context()
+    
+    def _push_ai_context(self):
+        """Übergibt die Auswahl des aktuellen Editors als Kontext an das AI-Panel"""
         editor = self._get_current_editor()
         if editor:
-            # Kontext für AI-Panel aktualisieren
             selected = editor.textCursor().selectedText()
             if selected:
                 self.ai_panel.set_context(selected, os.path.basename(editor.file_path or ""))
@@ -783,6 +861,10 @@ class MainWindow(QMainWindow):
         self.ai_panel.setVisible(visible)
         self.toggle_ai_action.setChecked(visible)
         self.ai_toolbar_btn.setChecked(visible)
+        
+        if visible:
+            self.ai_panel.set_ai_service(self.ai_service)
+            self._push_ai_context()
     
     # === Ausführen ===
     
@@ -808,6 +890,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Fehler", "Keine Datei zum Kompilieren vorhanden.")
             return
         
+        from gui.dialogs.build_dialog import BuildDialog
+        
         dialog = BuildDialog(
             editor.file_path,
             self.current_project.path if self.current_project else None,
@@ -832,60 +916,52 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Fehler", "Kein Projekt geöffnet.")
             return
         
-        results = self.analyzer.analyze_directory(self.current_project.path)
-        
-        # Alle Probleme sammeln
-        all_problems = []
-        for path, result in results.items():
-            for err in result.errors:
-                all_problems.append(Problem(
-                    severity=ProblemSeverity.ERROR,
-                    message=err['message'],
-                    file_path=path,
-                    line=err.get('line', 0)
-                ))
-            for warn in result.warnings:
-                all_problems.append(Problem(
-                    severity=ProblemSeverity.WARNING,
-                    message=warn['message'],
-                    file_path=path,
-                    line=warn.get('line', 0)
-                ))
-        
-        self.problems_panel.set_problems(all_problems)
+        if self._analyzer_worker and self._analyzer_worker.isRunning():
+            self.statusbar.showMessage("Analyse läuft bereits...", 3000)
+            return
+        
+        self.problems_panel.clear()
         self.output_tabs.setCurrentWidget(self.problems_panel)
+        self.statusbar.showMessage("Analysiere Projekt...")
         
+        self._analyzer_worker = AnalyzerWorker(self.current_project.path, self)
+        self._analyzer_worker.file_analyzed.connect(self._on_file_analyzed)
+        self._analyzer_worker.finished_all.connect(self._on_analysis_finished)
+        self._analyzer_worker.start()
+    
+    def _on_file_analyzed(self, path: str, result: 'AnalysisResult'):
+        """Übernimmt das Ergebnis einer Datei aus dem AnalyzerWorker"""
+        problems = self._problems_from_result(path, result)
+        if problems:
+            self.problems_panel.add_problems(problems)
+    
+    def _on_analysis_finished(self, file_count: int):
+        """Projektanalyse abgeschlossen"""
         self.statusbar.showMessage(
-            f"Analyse abgeschlossen: {len(results)} Dateien, "
+            f"Analyse abgeschlossen: {file_count} Dateien, "
             f"{self.problems_panel.get_error_count()} Fehler, "
             f"{self.problems_panel.get_warning_count()} Warnungen",
             5000
         )
     
-    def _show_analysis_results(self, result: AnalysisResult):
+    @staticmethod
+    def _problems_from_result(path: str, result: 'AnalysisResult',
+                              source: str = "") -> List[Problem]:
+        """Wandelt Fehler und Warnungen eines Analyse-Ergebnisses in Problems um"""
+        # Ein gemeinsamer String je Datei (auch über Analyse-Läufe hinweg)
+        path = sys.intern(path)
+        error, warning = ProblemSeverity.ERROR, ProblemSeverity.WARNING
+        problems = [Problem(error, e['message'], path, e.get('line', 0), 0, source)
+                    for e in result.errors]
+        problems.extend([Problem(warning, w['message'], path, w.get('line', 0), 0, source)
+                         for w in result.warnings])
+        return problems
+    
+    def _show_analysis_results(self, result: 'AnalysisResult'):
         """Zeigt Analyse-Ergebnisse"""
-        problems = []
-        
-        for err in result.errors:
-            problems.append(Problem(
-                severity=ProblemSeverity.ERROR,
-                message=err['message'],
-                file_path=result.file_path,
-                line=err.get('line', 0),
-                source='analyzer'
-            ))
-        
-        for warn in result.warnings:
-            problems.append(Problem(
-                severity=ProblemSeverity.WARNING,
-                message=warn['message'],
-                file_path=result.file_path,
-                line=warn.get('line', 0),
-                source='analyzer'
-            ))
-        
-        self.problems_panel.clear_file(result.file_path)
-        self.problems_panel.add_problems(problems)
+        problems = self._problems_from_result(result.file_path, result, 'analyzer')
+        
+        self.problems_panel.replace_file_problems(result.file_path, problems)
         self.output_tabs.setCurrentWidget(self.problems_panel)
     
     def _goto_problem(self, file_path: str, line: int, column: int):
@@ -909,6 +985,8 @@ class MainWindow(QMainWindow):
     
     def _show_settings(self):
         """Zeigt den Einstellungen-Dialog"""
+        from gui.dialogs.settings_dialog import SettingsDialog
+        
         dialog = SettingsDialog(self.settings, self)
         if dialog.exec():
             # Settings wurden gespeichert, neu laden
@@ -916,8 +994,9 @@ class MainWindow(QMainWindow):
     
     def _apply_settings(self):
         """Wendet geänderte Einstellungen an"""
-        # API-Key aktualisieren
-        self.ai_service.set_api_key(self.settings.get('ai.api_key', ''))
+        # API-Key aktualisieren (nur wenn der AI-Service bereits erstellt wurde)
+        if 'ai_service' in self.__dict__:
+            self.ai_service.set_api_key(self.settings.get('ai.api_key', ''))
         
         # Editor-Einstellungen auf alle offenen Editoren anwenden
         # TODO: Implementieren
@@ -956,31 +1035,43 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Wird beim Schließen aufgerufen"""
-        # Ungespeicherte Dateien prüfen
-        for path, editor in self.open_files.items():
-            if editor.is_modified():
-                reply = QMessageBox.question(
-                    self, "Ungespeicherte Änderungen",
-                    f"'{os.path.basename(path)}' wurde geändert. Speichern?",
-                    QMessageBox.StandardButton.Save |
-                    QMessageBox.StandardButton.Discard |
-                    QMessageBox.StandardButton.Cancel
-                )
-                
-                if reply == QMessageBox.StandardButton.Save:
+        # Ungespeicherte Dateien prüfen (eine Abfrage für alle)
+        dirty = [editor for editor in self._dirty_editors if editor.file_path]
+        if dirty:
+            names = "\n".join(sorted(os.path.basename(e.file_path) for e in dirty))
+            reply = QMessageBox.question(
+                self, "Ungespeicherte Änderungen",
+                f"{len(dirty)} Datei(en) wurden geändert:\n\n{names}\n\nAlle speichern?",
+                QMessageBox.StandardButton.SaveAll |
+                QMessageBox.StandardButton.Discard |
+                QMessageBox.StandardButton.Cancel
+            )
+            
+            if reply == QMessageBox.StandardButton.SaveAll:
+                for editor in dirty:
                     editor.save_file()
-                elif reply == QMessageBox.StandardButton.Cancel:
-                    event.ignore()
-                    return
+            elif reply == QMessageBox.StandardButton.Cancel:
+                event.ignore()
+                return
         
-        # Fenster-Status speichern
-        self.settings.save_window_state(self.saveGeometry(), self.saveState())
+        if self._analyzer_worker and self._analyzer_worker.isRunning():
+            self._analyzer_worker.requestInterruption()
+            self._analyzer_worker.wait()
+        
+        # Fenster-Status speichern (Qt-natives Binärformat)
+        qs = self._window_settings()
+        qs.setValue("window/geometry", self.saveGeometry())
+        qs.setValue("window/state", self.saveState())
+        qs.setValue("window/splitter", self.main_splitter.saveState())
         
         event.accept()
 
 
 def main():
     """Haupteinstiegspunkt"""
+    import multiprocessing
+    multiprocessing.freeze_support()  # Prozess-Pool der Analyse in EXE-Builds
+    
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     icon_path = Path(__file__).resolve().parents[2] / "DevCenter.ico"
@@ -992,8 +1083,18 @@ def main():
     if not icon.isNull():
         window.setWindowIcon(icon)
     window.show()
-    
-    sys.exit(app.exec())
+
+    # asyncio in die Qt-Eventloop integrieren (optional, via qasync)
+    try:
+        import qasync
+    except ImportError:
+        sys.exit(app.exec())
+    import asyncio  # erst hier: ohne qasync lädt der Start kein asyncio
+
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    with loop:
+        loop.run_forever()
 
 
 if __name__ == "__main__":
@@ -4,48 +4,79 @@ DevCenter - AI Assistant Panel
 Chat-Interface für Code-Generierung und Hilfe
 """
 
-import asyncio
+import re
+import sys
+from html import escape as _html_escape
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPlainTextEdit,
     QPushButton, QLabel, QComboBox, QSplitter, QProgressBar
 )
-from PySide6.QtCore import Qt, Signal, QThread, Slot
-from PySide6.QtGui import QFont, QTextCursor
-from typing import Optional
+from PySide6.QtCore import Qt, Signal, QThread, Slot, QCoreApplication
+from PySide6.QtGui import QFont, QTextCursor, QTextBlockFormat, QTextCharFormat, QColor
+from typing import Optional, TYPE_CHECKING
 
+# asyncio erst bei der ersten AI-Anfrage importieren (Startzeit)
+if TYPE_CHECKING:
+    import asyncio
+    import concurrent.futures
 
-class AIWorker(QThread):
-    """Worker Thread für AI-Anfragen"""
-    
-    response_received = Signal(str, bool)  # content, success
-    progress_update = Signal(str)
+
+_CODE_BLOCK_RE = re.compile(r'```(?:python)?\n(.*?)```', re.DOTALL)
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+
+_WELCOME_HTML = """
+        <div style="color: #888; padding: 10px;">
+            <h3 style="color: #cccccc;">Willkommen beim AI-Assistenten!</h3>
+            <p>Ich kann dir helfen mit:</p>
+            <ul>
+                <li>Code generieren aus Beschreibungen</li>
+                <li>Code reviewen und verbessern</li>
+                <li>Code erklären</li>
+                <li>Fehler beheben</li>
+            </ul>
+            <p><i>Wähle Code im Editor aus für Kontext.</i></p>
+        </div>
+        """
+
+# Chat-Verlauf begrenzen, damit das QTextDocument nicht unbegrenzt wächst
+_MAX_CHAT_BLOCKS = 500
+
+# Nachrichtenart -> (Titel, Hintergrund, Titelfarbe)
+_MESSAGE_STYLES = {
+    'user': ("Du:", "#094771", "#4ec9b0"),
+    'assistant': ("Assistent:", "#252526", "#569cd6"),
+    'error': ("Fehler:", "#5a1d1d", "#f44747"),
+}
+
+
+class AILoopThread(QThread):
+    """Langlebiger Thread mit eigener asyncio-Eventloop für AI-Anfragen"""
     
-    def __init__(self, ai_service, prompt: str, system: str = None):
-        super().__init__()
-        self.ai_service = ai_service
-        self.prompt = prompt
-        self.system = system
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import asyncio
+        self.loop = asyncio.new_event_loop()
     
     def run(self):
-        """Fuehrt die AI-Anfrage im Hintergrund aus."""
-        try:
-            # Synchroner Aufruf da wir in Thread sind
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            response = loop.run_until_complete(
-                self.ai_service.complete(self.prompt, self.system)
-            )
-            
-            loop.close()
-            
-            if response.success:
-                self.response_received.emit(response.content, True)
-            else:
-                self.response_received.emit(response.error or "Unbekannter Fehler", False)
-                
-        except Exception as e:
-            self.response_received.emit(str(e), False)
+        """Betreibt die Eventloop bis stop() aufgerufen wird."""
+        import asyncio
+        from modules.ai_assistant.ai_service import close_clients
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        # Verbindungen der Loop schließen, solange sie noch existiert
+        self.loop.run_until_complete(close_clients())
+        self.loop.close()
+    
+    def submit(self, coro) -> 'concurrent.futures.Future':
+        """Plant eine Coroutine threadsicher auf der Loop ein"""
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def stop(self):
+        """Beendet die Eventloop und wartet auf den Thread"""
+        if self.isRunning():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.wait()
 
 
 class AIAssistantPanel(QWidget):
@@ -61,11 +92,15 @@ class AIAssistantPanel(QWidget):
     
     code_generated = Signal(str)  # Generierter Code
     insert_code_requested = Signal(str)  # Code zum Einfügen
+    _response_ready = Signal(str, bool)  # content, success (aus Loop-Thread)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self._ai_service = None
-        self._worker: Optional[AIWorker] = None
+        self._loop_thread: Optional[AILoopThread] = None
+        self._future: Optional['concurrent.futures.Future'] = None
+        self._task: Optional['asyncio.Task'] = None
+        self._response_ready.connect(self._on_response)
         self._context_code = ""
         self._setup_ui()
     
@@ -101,8 +136,11 @@ class AIAssistantPanel(QWidget):
                 border-radius: 4px;
             }
         """)
-        self.chat_display.setHtml(self._get_welcome_html())
+        self.chat_display.setHtml(_WELCOME_HTML)
+        self.chat_display.document().setMaximumBlockCount(_MAX_CHAT_BLOCKS)
+        self._chat_scrollbar = self.chat_display.verticalScrollBar()
         splitter.addWidget(self.chat_display)
+        self._message_formats = self._create_message_formats()
         
         # Input-Bereich
         input_widget = QWidget()
@@ -167,21 +205,6 @@ class AIAssistantPanel(QWidget):
         """)
         layout.addWidget(self.progress)
     
-    def _get_welcome_html(self) -> str:
-        return """
-        <div style="color: #888; padding: 10px;">
-            <h3 style="color: #cccccc;">Willkommen beim AI-Assistenten!</h3>
-            <p>Ich kann dir helfen mit:</p>
-            <ul>
-                <li>Code generieren aus Beschreibungen</li>
-                <li>Code reviewen und verbessern</li>
-                <li>Code erklären</li>
-                <li>Fehler beheben</li>
-            </ul>
-            <p><i>Wähle Code im Editor aus für Kontext.</i></p>
-        </div>
-        """
-    
     def set_ai_service(self, ai_service):
         """Setzt den AI-Service"""
         self._ai_service = ai_service
@@ -200,7 +223,7 @@ class AIAssistantPanel(QWidget):
         self._context_code = code
         
         if code:
-            lines = len(code.split('\n'))
+            lines = code.count('\n') + 1
             self.context_label.setText(f"📄 {file_name or 'Auswahl'} ({lines} Zeilen)")
             self.context_label.setStyleSheet("color: #4ec9b0; font-size: 11px;")
         else:
@@ -213,16 +236,74 @@ class AIAssistantPanel(QWidget):
             self._add_error("AI-Service nicht verfügbar. API-Key in Einstellungen prüfen.")
             return
         
-        if self._worker and self._worker.isRunning():
+        if self._is_busy():
             self._add_error("Eine Anfrage läuft bereits...")
             return
         
         self._set_loading(True)
         self._add_user_message(prompt[:200] + "..." if len(prompt) > 200 else prompt)
         
-        self._worker = AIWorker(self._ai_service, prompt, system)
-        self._worker.response_received.connect(self._on_response)
-        self._worker.start()
+        loop = self._get_running_loop()
+        if loop is not None:
+            # qasync: Coroutine direkt auf der Qt-Eventloop ausführen
+            self._task = loop.create_task(self._ai_service.complete(prompt, system))
+            self._task.add_done_callback(self._on_future_done)
+            return
+        
+        self._future = self._get_loop_thread().submit(
+            self._ai_service.complete(prompt, system)
+        )
+        self._future.add_done_callback(self._on_future_done)
+    
+    def _is_busy(self) -> bool:
+        """True wenn bereits eine Anfrage läuft"""
+        if self._task and not self._task.done():
+            return True
+        return bool(self._future and not self._future.done())
+    
+    def _get_loop_thread(self) -> AILoopThread:
+        """Startet den Loop-Thread beim ersten Bedarf (einmalig)"""
+        if self._loop_thread is None:
+            self._loop_thread = AILoopThread(self)
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self._loop_thread.stop)
+            self._loop_thread.start()
+        return self._loop_thread
+    
+    def cancel_request(self):
+        """Bricht die laufende Anfrage ab"""
+        for pending in (self._task, self._future):
+            if pending is not None and not pending.done():
+                pending.cancel()
+    
+    @staticmethod
+    def _get_running_loop() -> Optional['asyncio.AbstractEventLoop']:
+        """Gibt die laufende asyncio-Loop des GUI-Threads zurück (nur mit qasync)"""
+        asyncio = sys.modules.get('asyncio')
+        if asyncio is None:
+            return None  # nie importiert -> keine Loop aktiv
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+    
+    def _on_future_done(self, future):
+        """Done-Callback für Task/Future; das Signal stellt in den GUI-Thread zu"""
+        if future.cancelled():
+            self._response_ready.emit("Anfrage abgebrochen", False)
+            return
+        
+        error = future.exception()
+        if error is not None:
+            self._response_ready.emit(str(error), False)
+            return
+        
+        response = future.result()
+        if response.success:
+            self._response_ready.emit(response.content, True)
+        else:
+            self._response_ready.emit(response.error or "Unbekannter Fehler", False)
     
     @Slot(str, bool)
     def _on_response(self, content: str, success: bool):
@@ -234,8 +315,7 @@ class AIAssistantPanel(QWidget):
             
             # Code extrahieren wenn vorhanden
             if "```" in content:
-                import re
-                code_blocks = re.findall(r'```(?:python)?\n(.*?)```', content, re.DOTALL)
+                code_blocks = _CODE_BLOCK_RE.findall(content)
                 if code_blocks:
                     self.code_generated.emit(code_blocks[0])
         else:
@@ -251,18 +331,41 @@ class AIAssistantPanel(QWidget):
         self.review_btn.setEnabled(not loading)
         self.explain_btn.setEnabled(not loading)
     
+    @staticmethod
+    def _create_message_formats() -> dict:
+        """Erstellt die Block-/Zeichenformate je Nachrichtenart einmalig"""
+        text_format = QTextCharFormat()
+        text_format.setForeground(QColor("#cccccc"))
+        
+        formats = {}
+        for kind, (title, background, title_color) in _MESSAGE_STYLES.items():
+            block_format = QTextBlockFormat()
+            block_format.setBackground(QColor(background))
+            block_format.setLeftMargin(8)
+            block_format.setRightMargin(8)
+            
+            # Titelzeile mit Abstand zur vorherigen Nachricht
+            title_block_format = QTextBlockFormat(block_format)
+            title_block_format.setTopMargin(6)
+            
+            title_format = QTextCharFormat()
+            title_format.setForeground(QColor(title_color))
+            title_format.setFontWeight(QFont.Weight.Bold)
+            
+            formats[kind] = (title, title_block_format, block_format, title_format, text_format)
+        return formats
+    
     def _add_user_message(self, text: str):
         """Fügt Benutzer-Nachricht hinzu"""
-        html = f"""
-        <div style="background-color: #094771; padding: 8px; margin: 4px 0; border-radius: 4px;">
-            <b style="color: #4ec9b0;">Du:</b>
-            <p style="color: #cccccc; margin: 4px 0;">{self._escape_html(text)}</p>
-        </div>
-        """
-        self._append_html(html)
+        self._append_message('user', text)
     
     def _add_assistant_message(self, text: str):
         """Fügt Assistenten-Nachricht hinzu"""
+        if "`" not in text:
+            # Ohne Code kein HTML-Parsing nötig
+            self._append_message('assistant', text)
+            return
+        
         # Code-Blöcke formatieren
         formatted = self._format_code_blocks(text)
         
@@ -276,42 +379,52 @@ class AIAssistantPanel(QWidget):
     
     def _add_error(self, text: str):
         """Fügt Fehler-Nachricht hinzu"""
-        html = f"""
-        <div style="background-color: #5a1d1d; padding: 8px; margin: 4px 0; border-radius: 4px;">
-            <b style="color: #f44747;">Fehler:</b>
-            <p style="color: #cccccc; margin: 4px 0;">{self._escape_html(text)}</p>
-        </div>
-        """
-        self._append_html(html)
+        self._append_message('error', text)
+    
+    def _append_message(self, kind: str, text: str):
+        """Fügt eine Nachricht als Textblöcke mit vorbereiteten Formaten hinzu"""
+        title, title_block, text_block, title_format, text_format = self._message_formats[kind]
+        
+        self.chat_display.setUpdatesEnabled(False)  # Einfügen + Scrollen in einem Repaint
+        cursor = self.chat_display.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertBlock(title_block, title_format)
+        cursor.insertText(title, title_format)
+        cursor.insertBlock(text_block, text_format)
+        cursor.insertText(text, text_format)
+        self.chat_display.setTextCursor(cursor)
+        self._chat_scrollbar.setValue(self._chat_scrollbar.maximum())
+        self.chat_display.setUpdatesEnabled(True)
     
     def _append_html(self, html: str):
         """Fügt HTML zum Chat hinzu"""
+        self.chat_display.setUpdatesEnabled(False)
         cursor = self.chat_display.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
         cursor.insertHtml(html)
         self.chat_display.setTextCursor(cursor)
-        self.chat_display.verticalScrollBar().setValue(
-            self.chat_display.verticalScrollBar().maximum()
-        )
+        self._chat_scrollbar.setValue(self._chat_scrollbar.maximum())
+        self.chat_display.setUpdatesEnabled(True)
     
     def _escape_html(self, text: str) -> str:
         """Escaped HTML-Zeichen"""
-        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace("\n", "<br>")
+        return _html_escape(text, quote=False).replace("\n", "<br>")
     
     def _format_code_blocks(self, text: str) -> str:
         """Formatiert Code-Blöcke"""
-        import re
-        
         def replace_code(match):
             code = match.group(1)
             escaped = self._escape_html(code)
             return f'<pre style="background-color: #1e1e1e; padding: 8px; border-radius: 4px; font-family: Consolas; overflow-x: auto;">{escaped}</pre>'
         
         # Mehrzeilige Code-Blöcke
-        text = re.sub(r'```(?:python)?\n(.*?)```', replace_code, text, flags=re.DOTALL)
+        if "```" in text:
+            text = _CODE_BLOCK_RE.sub(replace_code, text)
         
         # Inline-Code
-        text = re.sub(r'`([^`]+)`', r'<code style="background-color: #1e1e1e; padding: 2px 4px;">\1</code>', text)
+        if "`" in text:
+            text = _INLINE_CODE_RE.sub(r'<code style="background-color: #1e1e1e; padding: 2px 4px;">\1</code>', text)
         
         # Normale Zeilenumbrüche
         text = text.replace("\n", "<br>")
@@ -353,6 +466,6 @@ class AIAssistantPanel(QWidget):
     
     def clear_chat(self):
         """Leert den Chat-Verlauf"""
-        self.chat_display.setHtml(self._get_welcome_html())
+        self.chat_display.setHtml(_WELCOME_HTML)
         if self._ai_service:
             self._ai_service.clear_history()
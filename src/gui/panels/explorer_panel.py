@@ -5,14 +5,86 @@ Datei-Navigation und Projekt-Struktur
 """
 
 import os
+import shutil
+import time
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Set
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTreeView, QLineEdit,
     QPushButton, QMenu, QLabel, QMessageBox, QInputDialog
 )
-from PySide6.QtCore import Qt, Signal, QDir, QModelIndex
+from PySide6.QtCore import (
+    Qt, Signal, QDir, QModelIndex, QTimer, QThread, QRunnable, QThreadPool
+)
 from PySide6.QtGui import QAction
-from PySide6.QtWidgets import QFileSystemModel
+from PySide6.QtWidgets import QFileSystemModel, QFileIconProvider
+
+
+EXISTS_TTL_S = 5  # Gültigkeit eines gecachten Existenz-Checks
+
+
+@lru_cache(maxsize=64)
+def _cached_exists(path: str, time_bucket: int) -> bool:
+    """os.path.exists, je Zeitfenster nur einmal ausgeführt"""
+    return os.path.exists(path)
+
+
+def _path_exists(path: str) -> bool:
+    """Existenz-Check mit kurzer Cache-Dauer (spart stat auf langsamen Laufwerken)"""
+    return _cached_exists(path, int(time.monotonic() // EXISTS_TTL_S))
+
+
+class _FsWorker(QRunnable):
+    """Führt eine langsame Dateisystem-Operation im Thread-Pool aus"""
+    
+    def __init__(self, op: str, func, args: tuple, result_signal):
+        super().__init__()
+        self.op = op
+        self.func = func
+        self.args = args
+        self.result_signal = result_signal
+    
+    def run(self):
+        try:
+            self.func(*self.args)
+            error = ""
+        except Exception as e:
+            error = str(e)
+        self.result_signal.emit(self.op, self.args, error)
+
+
+class DirScanner(QThread):
+    """Liest die obersten Ebenen eines Verzeichnisses im Hintergrund (os.scandir, ohne stat)"""
+    
+    results_ready = Signal(str, list)  # root, [(name, is_dir)]
+    
+    def __init__(self, root: str, depth: int = 2, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.depth = depth
+    
+    def run(self):
+        """Durchläuft das Verzeichnis ebenenweise bis zur angegebenen Tiefe."""
+        entries = []
+        level = [self.root]
+        for _ in range(self.depth):
+            next_level = []
+            for folder in level:
+                if self.isInterruptionRequested():
+                    return
+                try:
+                    with os.scandir(folder) as it:
+                        for entry in it:
+                            is_dir = entry.is_dir()
+                            entries.append((entry.name, is_dir))
+                            if is_dir:
+                                next_level.append(entry.path)
+                except OSError:
+                    continue
+            level = next_level
+        
+        self.results_ready.emit(self.root, entries)
 
 
 class ExplorerPanel(QWidget):
@@ -31,9 +103,24 @@ class ExplorerPanel(QWidget):
     file_deleted = Signal(str)
     folder_created = Signal(str)
     
+    # Ergebnis einer Operation aus dem Thread-Pool (op, args, Fehlertext oder "")
+    _fs_op_finished = Signal(str, object, str)
+    
+    # Standard-Filter: Nur relevante Dateien
+    DEFAULT_FILTERS = (
+        "*.py", "*.pyw", "*.txt", "*.md", "*.json", "*.xml",
+        "*.html", "*.css", "*.js", "*.yml", "*.yaml", "*.ini",
+        "*.cfg", "*.toml", "*.rst", "*.bat", "*.sh", "*.sql"
+    )
+    FILTER_DELAY_MS = 200  # Tastendrücke zu einem Filter-Update zusammenfassen
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self._root_path = ""
+        self._pending_filter = ""
+        self._expanded_paths: Set[str] = set()
+        self._scanner: DirScanner = None
+        self._fs_op_finished.connect(self._on_fs_op_finished)
         self._setup_ui()
     
     def _setup_ui(self):
@@ -80,14 +167,30 @@ class ExplorerPanel(QWidget):
         """)
         layout.addWidget(self.filter_input)
         
+        # Platzhalter während des Hintergrund-Scans
+        self.loading_label = QLabel("Lädt...")
+        self.loading_label.setStyleSheet("color: #888; padding: 4px 8px;")
+        self.loading_label.setVisible(False)
+        layout.addWidget(self.loading_label)
+        
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.timeout.connect(self._do_apply_filter)
+        
         # Tree View
         self.tree = QTreeView()
         self.tree.setHeaderHidden(True)
-        self.tree.setAnimated(True)
+        self.tree.setAnimated(False)  # Animationen erzwingen Dauer-Repaints
+        self.tree.setUniformRowHeights(True)  # Zeilen nicht einzeln vermessen
+        self.tree.setExpandsOnDoubleClick(False)  # Doppelklick in _on_double_click
         self.tree.setIndentation(16)
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self._show_context_menu)
         self.tree.doubleClicked.connect(self._on_double_click)
+        self.tree.expanded.connect(
+            lambda index: self._expanded_paths.add(self.model.filePath(index)))
+        self.tree.collapsed.connect(
+            lambda index: self._expanded_paths.discard(self.model.filePath(index)))
         
         self.tree.setStyleSheet("""
             QTreeView {
@@ -119,14 +222,15 @@ class ExplorerPanel(QWidget):
         
         # File System Model
         self.model = QFileSystemModel()
+        
+        # Keine Shell-Abfragen für benutzerdefinierte Ordner-Icons (langsam unter Windows)
+        self._icon_provider = QFileIconProvider()
+        self._icon_provider.setOptions(QFileIconProvider.Option.DontUseCustomDirectoryIcons)
+        self.model.setIconProvider(self._icon_provider)
+        
         self.model.setRootPath("")
         
-        # Filter: Nur relevante Dateien
-        self.model.setNameFilters([
-            "*.py", "*.pyw", "*.txt", "*.md", "*.json", "*.xml",
-            "*.html", "*.css", "*.js", "*.yml", "*.yaml", "*.ini",
-            "*.cfg", "*.toml", "*.rst", "*.bat", "*.sh", "*.sql"
-        ])
+        self.model.setNameFilters(self.DEFAULT_FILTERS)
         self.model.setNameFilterDisables(False)
         
         self.tree.setModel(self.model)
@@ -139,14 +243,51 @@ class ExplorerPanel(QWidget):
     
     def set_root_path(self, path: str):
         """Setzt das Wurzelverzeichnis"""
-        if os.path.exists(path):
+        if _path_exists(path):
             self._root_path = path
-            self.model.setRootPath(path)
-            self.tree.setRootIndex(self.model.index(path))
+            
+            # Netzlaufwerke: keine Symlink-Auflösung und kein Dateisystem-Watcher
+            remote = self._is_network_path(path)
+            self.model.setResolveSymlinks(not remote)
+            self.model.setOption(QFileSystemModel.Option.DontWatchForChanges, remote)
             
             # Titel aktualisieren
-            project_name = os.path.basename(path)
+            project_name = os.path.basename(path.rstrip('/\\'))  # rein textuell
             self.title_label.setText(f"📁 {project_name.upper()}")
+            
+            self._start_scan(path)
+    
+    def _start_scan(self, path: str):
+        """Scannt das Verzeichnis im Hintergrund; das Modell folgt in _on_scan_ready"""
+        if self._scanner is not None and self._scanner.isRunning():
+            self._scanner.requestInterruption()  # Ergebnis wird verworfen
+        
+        self.loading_label.setVisible(True)
+        self._scanner = DirScanner(path, parent=self)
+        self._scanner.results_ready.connect(self._on_scan_ready)
+        self._scanner.finished.connect(self._on_scan_finished)
+        self._scanner.start()
+    
+    def _on_scan_finished(self):
+        """Gibt einen beendeten Scanner frei"""
+        scanner = self.sender()
+        if scanner is self._scanner:
+            self._scanner = None
+        scanner.deleteLater()
+    
+    def _on_scan_ready(self, root: str, entries: list):
+        """Setzt das Modell auf das gescannte Verzeichnis (Verzeichniscache ist jetzt warm)"""
+        if root != self._root_path:
+            return  # inzwischen anderes Projekt gewählt
+        
+        self.loading_label.setVisible(False)
+        self.model.setRootPath(root)
+        self.tree.setRootIndex(self.model.index(root))
+    
+    @staticmethod
+    def _is_network_path(path: str) -> bool:
+        """True für UNC-Pfade (\\\\server\\share bzw. //server/share)"""
+        return os.path.abspath(path).startswith(('\\\\', '//'))
     
     def get_selected_path(self) -> str:
         """Gibt den ausgewählten Pfad zurück"""
@@ -156,35 +297,65 @@ class ExplorerPanel(QWidget):
         return ""
     
     def _refresh(self):
-        """Aktualisiert die Ansicht"""
+        """Aktualisiert die Ansicht (vollständiger Neuaufbau des Modells)"""
         if self._root_path:
+            expanded = list(self._expanded_paths)
             self.model.setRootPath("")
             self.model.setRootPath(self._root_path)
+            self.restore_expansion(expanded)
+    
+    def _refresh_after_change(self):
+        """Aktualisiert nach einer eigenen Dateioperation"""
+        # Mit aktivem Dateisystem-Watcher aktualisiert das Modell das
+        # Verzeichnis selbst; nur ohne Watcher (Netzlaufwerk) neu aufbauen
+        if self.model.testOption(QFileSystemModel.Option.DontWatchForChanges):
+            self._refresh()
     
     def _collapse_all(self):
         """Klappt alle Knoten zu"""
         self.tree.collapseAll()
+        self._expanded_paths.clear()
+    
+    def expand_all(self, depth: int = 2):
+        """Klappt die obersten Ebenen in einem Durchgang auf"""
+        self.tree.expandRecursively(self.tree.rootIndex(), depth)
+    
+    def expanded_paths(self) -> List[str]:
+        """Gibt die aufgeklappten Verzeichnisse zurück (z.B. zum Speichern)"""
+        return sorted(self._expanded_paths)
+    
+    def restore_expansion(self, paths: List[str]):
+        """Klappt die angegebenen Verzeichnisse mit nur einem Neuzeichnen auf"""
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for path in paths:
+                index = self.model.index(path)
+                if index.isValid():
+                    self.tree.expand(index)
+        finally:
+            self.tree.setUpdatesEnabled(True)
     
     def _apply_filter(self, text: str):
-        """Wendet Dateifilter an"""
+        """Merkt den Filter vor und wendet ihn verzögert an"""
+        self._pending_filter = text
+        self._filter_timer.start(self.FILTER_DELAY_MS)
+    
+    def _do_apply_filter(self):
+        """Wendet den vorgemerkten Dateifilter an"""
+        text = self._pending_filter
         if text:
             # Dynamischer Filter
-            patterns = [f"*{text}*"]
-            self.model.setNameFilters(patterns)
+            self.model.setNameFilters([f"*{text}*"])
         else:
             # Standard-Filter
-            self.model.setNameFilters([
-                "*.py", "*.pyw", "*.txt", "*.md", "*.json", "*.xml",
-                "*.html", "*.css", "*.js", "*.yml", "*.yaml", "*.ini",
-                "*.cfg", "*.toml", "*.rst", "*.bat", "*.sh", "*.sql"
-            ])
+            self.model.setNameFilters(self.DEFAULT_FILTERS)
     
     def _on_double_click(self, index: QModelIndex):
         """Behandelt Doppelklick"""
-        path = self.model.filePath(index)
-        
-        if os.path.isfile(path):
-            self.file_selected.emit(path)
+        if self.model.isDir(index):
+            self.tree.setExpanded(index, not self.tree.isExpanded(index))
+        else:
+            self.file_selected.emit(self.model.filePath(index))
     
     def _show_context_menu(self, position):
         """Zeigt Kontextmenü"""
@@ -257,7 +428,7 @@ class ExplorerPanel(QWidget):
             try:
                 os.rename(path, new_path)
                 self.file_renamed.emit(path, new_path)
-                self._refresh()
+                self._refresh_after_change()
             except Exception as e:
                 QMessageBox.warning(self, "Fehler", f"Umbenennen fehlgeschlagen: {e}")
     
@@ -273,7 +444,7 @@ class ExplorerPanel(QWidget):
             try:
                 os.remove(path)
                 self.file_deleted.emit(path)
-                self._refresh()
+                self._refresh_after_change()
             except Exception as e:
                 QMessageBox.warning(self, "Fehler", f"Löschen fehlgeschlagen: {e}")
     
@@ -288,7 +459,7 @@ class ExplorerPanel(QWidget):
             try:
                 with open(path, 'w', encoding='utf-8') as f:
                     f.write("")
-                self._refresh()
+                self._refresh_after_change()
                 self.file_selected.emit(path)
             except Exception as e:
                 QMessageBox.warning(self, "Fehler", f"Erstellen fehlgeschlagen: {e}")
@@ -304,7 +475,7 @@ class ExplorerPanel(QWidget):
             try:
                 os.makedirs(path, exist_ok=True)
                 self.folder_created.emit(path)
-                self._refresh()
+                self._refresh_after_change()
             except Exception as e:
                 QMessageBox.warning(self, "Fehler", f"Erstellen fehlgeschlagen: {e}")
     
@@ -317,9 +488,13 @@ class ExplorerPanel(QWidget):
         
         if ok and new_name and new_name != name:
             new_path = os.path.join(os.path.dirname(path), new_name)
+            if self._is_network_path(path):
+                # Auf Netzlaufwerken kann auch ein rename dauern
+                self._run_fs_op('rename', os.rename, path, new_path)
+                return
             try:
                 os.rename(path, new_path)
-                self._refresh()
+                self._refresh_after_change()
             except Exception as e:
                 QMessageBox.warning(self, "Fehler", f"Umbenennen fehlgeschlagen: {e}")
     
@@ -332,12 +507,25 @@ class ExplorerPanel(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            import shutil
-            try:
-                shutil.rmtree(path)
-                self._refresh()
-            except Exception as e:
-                QMessageBox.warning(self, "Fehler", f"Löschen fehlgeschlagen: {e}")
+            # rmtree dauert bei großen Bäumen -> nicht im GUI-Thread
+            self._run_fs_op('delete', shutil.rmtree, path)
+    
+    def _run_fs_op(self, op: str, func, *args):
+        """Startet eine Dateisystem-Operation im globalen Thread-Pool"""
+        QThreadPool.globalInstance().start(
+            _FsWorker(op, func, args, self._fs_op_finished)
+        )
+    
+    def _on_fs_op_finished(self, op: str, args: tuple, error: str):
+        """Meldet Fehler bzw. aktualisiert nach einer Thread-Pool-Operation"""
+        if error:
+            action = "Löschen" if op == 'delete' else "Umbenennen"
+            QMessageBox.warning(self, "Fehler", f"{action} fehlgeschlagen: {error}")
+            return
+        
+        self._refresh_after_change()
+        if op == 'delete':
+            self.file_deleted.emit(args[0])
     
     def _copy_path(self, path: str):
         """Kopiert Pfad in Zwischenablage"""
@@ -4,16 +4,25 @@ DevCenter - Output Panel
 Terminal-Ausgabe und Prozess-Steuerung
 """
 
+import codecs
 import os
+import subprocess
 import sys
+from typing import List
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit,
     QPushButton, QComboBox, QLabel, QToolBar
 )
-from PySide6.QtCore import Qt, Signal, QProcess, QTimer
+from PySide6.QtCore import Qt, Signal, QProcess, QProcessEnvironment, QTimer
 from PySide6.QtGui import QFont, QTextCharFormat, QColor, QTextCursor
 
 
+# Farben einmalig beim Import (int-Konstruktor, kein Parsen von Hex-Strings)
+_COLOR_INFO = QColor(0x88, 0x88, 0x88)
+_COLOR_ERROR = QColor(0xf4, 0x47, 0x47)
+_COLOR_SUCCESS = QColor(0x4e, 0xc9, 0xb0)
+
+
 class OutputPanel(QWidget):
     """
     Terminal/Output Panel für Programmausgaben
@@ -28,10 +37,16 @@ class OutputPanel(QWidget):
     process_started = Signal(str)  # command
     process_finished = Signal(int)  # exit_code
     
+    FLUSH_INTERVAL_MS = 33  # Prozessausgabe mit ~30 Hz in die Ansicht schreiben
+    MAX_LINES = 10000  # Ringpuffer-Größe der Ansicht
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self._process: QProcess = None
         self._auto_scroll = True
+        self._out_buf = bytearray()
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._python_environment: QProcessEnvironment = None
         self._setup_ui()
     
     def _setup_ui(self):
@@ -80,9 +95,26 @@ class OutputPanel(QWidget):
                 selection-background-color: #264f78;
             }
         """)
-        self.output.setMaximumBlockCount(10000)  # Max Zeilen
+        self.output.setMaximumBlockCount(self.MAX_LINES)  # älteste Zeilen fallen heraus
+        # Reine Log-Ansicht: kein Undo-Stack, kein Umbruch (wie im Terminal)
+        self.output.setUndoRedoEnabled(False)
+        self.output.setCenterOnScroll(False)
+        self.output.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.output.document().setDocumentMargin(2)
         layout.addWidget(self.output)
         
+        # Einmalig erzeugt und bei jedem Anhängen wiederverwendet
+        self._cursor = QTextCursor(self.output.document())
+        self._scrollbar = self.output.verticalScrollBar()
+        self._fmt_output = QTextCharFormat()
+        self._fmt_info = self._color_format(_COLOR_INFO)
+        self._fmt_error = self._color_format(_COLOR_ERROR)
+        self._fmt_success = self._color_format(_COLOR_SUCCESS)
+        
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_output)
+        
         # Status
         self.status_label = QLabel("Bereit")
         self.status_label.setStyleSheet("padding: 2px 4px; color: #888;")
@@ -101,12 +133,36 @@ class OutputPanel(QWidget):
     
     def run_command(self, command: str, cwd: str = None):
         """
-        Führt einen Shell-Befehl aus
+        Führt einen Shell-Befehl aus (über cmd/bash; für bekannte
+        Programme ist run_argv schneller)
         
         Args:
             command: Auszuführender Befehl
             cwd: Arbeitsverzeichnis
         """
+        # Windows vs Unix
+        if sys.platform == 'win32':
+            self._start_process('cmd', ['/c', command], cwd, command)
+        else:
+            self._start_process('bash', ['-c', command], cwd, command)
+    
+    def run_argv(self, program: str, args: List[str], cwd: str = None,
+                 env: QProcessEnvironment = None):
+        """
+        Startet ein Programm direkt ohne Shell-Zwischenprozess
+        
+        Args:
+            program: Ausführbare Datei
+            args: Argumente (werden nicht von einer Shell interpretiert)
+            cwd: Arbeitsverzeichnis
+            env: Prozess-Umgebung (Standard: geerbt)
+        """
+        display = subprocess.list2cmdline([program, *args])
+        self._start_process(program, args, cwd, display, env)
+    
+    def _start_process(self, program: str, args: List[str], cwd: str,
+                       display: str, env: QProcessEnvironment = None):
+        """Startet den QProcess und verbindet die Ausgabe"""
         if self._process and self._process.state() == QProcess.ProcessState.Running:
             self.append_error("Ein Prozess läuft bereits!")
             return
@@ -119,19 +175,21 @@ class OutputPanel(QWidget):
         
         if cwd:
             self._process.setWorkingDirectory(cwd)
+        if env is not None:
+            self._process.setProcessEnvironment(env)
         
-        # Windows vs Unix
-        if sys.platform == 'win32':
-            self._process.start('cmd', ['/c', command])
-        else:
-            self._process.start('bash', ['-c', command])
+        self._out_buf.clear()
+        self._decoder.reset()
+        self._flush_timer.start()
+        
+        self._process.start(program, args)
         
         self.run_button.setEnabled(False)
         self.stop_button.setEnabled(True)
-        self.status_label.setText(f"Läuft: {command[:50]}...")
+        self.status_label.setText(f"Läuft: {display[:50]}...")
         
-        self.append_info(f"$ {command}\n")
-        self.process_started.emit(command)
+        self.append_info(f"$ {display}\n")
+        self.process_started.emit(display)
     
     def run_python_file(self, file_path: str, args: list = None):
         """
@@ -141,20 +199,41 @@ class OutputPanel(QWidget):
             file_path: Pfad zur Python-Datei
             args: Zusätzliche Argumente
         """
-        cmd = f'"{sys.executable}" "{file_path}"'
-        if args:
-            cmd += ' ' + ' '.join(args)
-        
-        cwd = os.path.dirname(file_path)
-        self.run_command(cmd, cwd)
+        self.run_argv(sys.executable, [file_path, *(args or [])],
+                      cwd=os.path.dirname(file_path), env=self._python_env())
+    
+    def _python_env(self) -> QProcessEnvironment:
+        """Umgebung für Python-Prozesse: ungepuffert und UTF-8 (einmalig erstellt)"""
+        if self._python_environment is None:
+            env = QProcessEnvironment.systemEnvironment()
+            env.insert("PYTHONUNBUFFERED", "1")  # Ausgabe sofort sichtbar
+            env.insert("PYTHONIOENCODING", "utf-8")  # passend zu _decoder
+            self._python_environment = env
+        return self._python_environment
     
     def _on_output(self):
+        """Puffert die Ausgabe nur; geschrieben wird in _flush_output"""
         if self._process:
-            data = self._process.readAllStandardOutput()
-            text = bytes(data).decode('utf-8', errors='replace')
+            self._out_buf += self._process.readAllStandardOutput().data()
+    
+    def _flush_output(self, final: bool = False):
+        """Schreibt die gepufferte Ausgabe in einem Stück in die Ansicht"""
+        if not self._out_buf and not final:
+            return
+        # Inkrementell dekodieren: an der Puffergrenze geteilte UTF-8-Zeichen bleiben erhalten
+        text = self._decoder.decode(bytes(self._out_buf), final=final)
+        self._out_buf.clear()
+        if text.count('\n') > self.MAX_LINES:
+            # Nur das Ende einfügen, der Rest würde sofort wieder gekürzt
+            text = '\n'.join(text.split('\n')[-self.MAX_LINES:])
+        if text:
             self.append_output(text)
     
     def _on_finished(self, exit_code, exit_status):
+        self._flush_timer.stop()
+        self._on_output()  # Restdaten der Pipe
+        self._flush_output(final=True)
+        
         self.run_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         
@@ -176,59 +255,40 @@ class OutputPanel(QWidget):
             QProcess.ProcessError.ReadError: "Lesefehler",
             QProcess.ProcessError.UnknownError: "Unbekannter Fehler"
         }
+        if error == QProcess.ProcessError.FailedToStart:
+            self._flush_timer.stop()  # finished folgt nicht
         self.append_error(f"\n⚠ {error_messages.get(error, 'Fehler')}")
     
-    def append_output(self, text: str):
-        """Fügt normale Ausgabe hinzu"""
-        self.output.moveCursor(QTextCursor.MoveOperation.End)
-        self.output.insertPlainText(text)
+    @staticmethod
+    def _color_format(color: QColor) -> QTextCharFormat:
+        """Erzeugt ein Zeichenformat mit Vordergrundfarbe"""
+        fmt = QTextCharFormat()
+        fmt.setForeground(color)
+        return fmt
+    
+    def _append(self, text: str, fmt: QTextCharFormat):
+        """Hängt Text mit Format am Ende an und scrollt ggf. nach unten"""
+        self._cursor.movePosition(QTextCursor.MoveOperation.End)
+        self._cursor.insertText(text, fmt)
         
         if self._auto_scroll:
-            self.output.verticalScrollBar().setValue(
-                self.output.verticalScrollBar().maximum()
-            )
+            self._scrollbar.setValue(self._scrollbar.maximum())
+    
+    def append_output(self, text: str):
+        """Fügt normale Ausgabe hinzu"""
+        self._append(text, self._fmt_output)
     
     def append_info(self, text: str):
         """Fügt Info-Text hinzu (grau)"""
-        cursor = self.output.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        
-        fmt = QTextCharFormat()
-        fmt.setForeground(QColor("#888888"))
-        cursor.insertText(text, fmt)
-        
-        if self._auto_scroll:
-            self.output.verticalScrollBar().setValue(
-                self.output.verticalScrollBar().maximum()
-            )
+        self._append(text, self._fmt_info)
     
     def append_error(self, text: str):
         """Fügt Fehler-Text hinzu (rot)"""
-        cursor = self.output.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        
-        fmt = QTextCharFormat()
-        fmt.setForeground(QColor("#f44747"))
-        cursor.insertText(text, fmt)
-        
-        if self._auto_scroll:
-            self.output.verticalScrollBar().setValue(
-                self.output.verticalScrollBar().maximum()
-            )
+        self._append(text, self._fmt_error)
     
     def append_success(self, text: str):
         """Fügt Erfolgs-Text hinzu (grün)"""
-        cursor = self.output.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        
-        fmt = QTextCharFormat()
-        fmt.setForeground(QColor("#4ec9b0"))
-        cursor.insertText(text, fmt)
-        
-        if self._auto_scroll:
-            self.output.verticalScrollBar().setValue(
-                self.output.verticalScrollBar().maximum()
-            )
+        self._append(text, self._fmt_success)
     
     def clear(self):
         """Leert die Ausgabe"""
@@ -4,14 +4,19 @@ DevCenter - Problems Panel
 Anzeige von Fehlern, Warnungen und Hinweisen
 """
 
+import ntpath
+import sys
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTreeView,
     QPushButton, QLabel, QComboBox, QLineEdit
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import (
+    Qt, Signal, QAbstractItemModel, QModelIndex, QSortFilterProxyModel
+)
 from PySide6.QtGui import QColor, QIcon
-from dataclasses import dataclass
-from typing import List, Optional
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, FrozenSet
 from enum import Enum
 
 
@@ -22,7 +27,7 @@ class ProblemSeverity(Enum):
     HINT = "hint"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Problem:
     """Ein Problem/Fehler/Warnung"""
     severity: ProblemSeverity
@@ -32,6 +37,274 @@ class Problem:
     column: int = 0
     source: str = ""  # z.B. "analyzer", "linter", "python"
     code: str = ""    # Fehlercode z.B. "E501"
+    file_name: str = field(init=False, repr=False, compare=False)
+    search_key: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # frozen: Felder nur über object.__setattr__ setzbar
+        # Dateiname einmalig bestimmen (ntpath trennt an / und \\)
+        object.__setattr__(self, 'file_name', ntpath.basename(self.file_path))
+        # Kleingeschriebener Suchtext aus Meldung und Pfad (\0 trennt, kommt in Suchen nicht vor)
+        object.__setattr__(self, 'search_key', f"{self.message}\0{self.file_path}".lower())
+        # Wiederkehrende Kürzel teilen sich einen String
+        object.__setattr__(self, 'source', sys.intern(self.source))
+        object.__setattr__(self, 'code', sys.intern(self.code))
+
+
+# Icon und Farbe je Schweregrad
+_SEVERITY_ICONS = {
+    ProblemSeverity.ERROR: "❌",
+    ProblemSeverity.WARNING: "⚠️",
+    ProblemSeverity.INFO: "ℹ️",
+    ProblemSeverity.HINT: "💡"
+}
+# Farben einmalig beim Import (int-Konstruktor, kein Parsen von Hex-Strings)
+_COLOR_ERROR = QColor(0xf4, 0x47, 0x47)
+_COLOR_WARNING = QColor(0xcc, 0xa7, 0x00)
+_COLOR_INFO = QColor(0x75, 0xbe, 0xff)
+_COLOR_HINT = QColor(0x89, 0xd1, 0x85)
+_COLOR_DEFAULT = QColor(0xcc, 0xcc, 0xcc)
+_SEVERITY_COLORS = {
+    ProblemSeverity.ERROR: _COLOR_ERROR,
+    ProblemSeverity.WARNING: _COLOR_WARNING,
+    ProblemSeverity.INFO: _COLOR_INFO,
+    ProblemSeverity.HINT: _COLOR_HINT
+}
+
+
+class ProblemsModel(QAbstractItemModel):
+    """Nach Datei gruppiertes Modell: eine Zeile je Datei, Probleme als Kinder
+
+    Texte entstehen erst in data(); die View fragt Kinder erst beim
+    Aufklappen einer Datei ab. Der internalPointer eines Problem-Index ist
+    der (internierte) Dateipfad seiner Gruppe.
+    """
+    
+    HEADERS = ("Problem", "Datei", "Zeile")
+    SeverityRole = Qt.ItemDataRole.UserRole + 1
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files: List[str] = []  # Gruppen in Einfügereihenfolge
+        self._groups: Dict[str, List[Problem]] = {}
+        self._file_rows: Dict[str, int] = {}
+    
+    # --- QAbstractItemModel ---
+    
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not parent.isValid():
+            if 0 <= row < len(self._files):
+                return self.createIndex(row, column)
+            return QModelIndex()
+        if parent.internalPointer() is None:
+            file_path = self._files[parent.row()]
+            if 0 <= row < len(self._groups[file_path]):
+                return self.createIndex(row, column, file_path)
+        return QModelIndex()
+    
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        file_path = index.internalPointer()
+        if file_path is None:
+            return QModelIndex()
+        return self.createIndex(self._file_rows[file_path], 0)
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._files)
+        if parent.internalPointer() is None and parent.column() == 0:
+            return len(self._groups[self._files[parent.row()]])
+        return 0
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self.HEADERS)
+    
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if not parent.isValid():
+            return bool(self._files)
+        return parent.internalPointer() is None and parent.column() == 0
+    
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        file_path = index.internalPointer()
+        if file_path is None:
+            return self._file_data(self._files[index.row()], index.column(), role)
+        
+        problem = self._groups[file_path][index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                message = f"{_SEVERITY_ICONS.get(problem.severity, '')} {problem.message}"
+                if problem.code:
+                    message += f" [{problem.code}]"
+                return message
+            if column == 1:
+                return problem.file_name
+            return str(problem.line) if problem.line else ""
+        
+        if role == Qt.ItemDataRole.ForegroundRole and column == 0:
+            return _SEVERITY_COLORS.get(problem.severity, _COLOR_DEFAULT)
+        
+        if role == Qt.ItemDataRole.UserRole:
+            return problem
+        
+        if role == self.SeverityRole:
+            return problem.severity
+        
+        return None
+    
+    def _file_data(self, file_path: str, column: int, role: int):
+        """Daten einer Datei-Zeile (Name und Anzahl der Probleme)"""
+        if column != 0:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            group = self._groups[file_path]
+            return f"📄 {group[0].file_name} ({len(group)})"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return file_path
+        return None
+    
+    # --- Daten ---
+    
+    def problem(self, index: QModelIndex) -> Optional[Problem]:
+        """Gibt das Problem eines Index zurück (None für Datei-Zeilen)"""
+        file_path = index.internalPointer()
+        if file_path is None:
+            return None
+        return self._groups[file_path][index.row()]
+    
+    def problems(self) -> List[Problem]:
+        """Gibt alle Probleme zurück (dateiweise)"""
+        return [problem for file_path in self._files for problem in self._groups[file_path]]
+    
+    def file_problems(self, file_path: str) -> List[Problem]:
+        """Gibt die Probleme einer Datei zurück"""
+        return self._groups.get(file_path, [])
+    
+    def set_problems(self, problems: List[Problem]):
+        """Ersetzt alle Probleme (ein Model-Reset)"""
+        self.beginResetModel()
+        self._files = []
+        self._groups = {}
+        for file_path, group in self._group_by_file(problems).items():
+            self._files.append(file_path)
+            self._groups[file_path] = group
+        self._file_rows = {file_path: row for row, file_path in enumerate(self._files)}
+        self.endResetModel()
+    
+    def add_problems(self, problems: List[Problem]):
+        """Hängt Probleme an, ohne bestehende Zeilen neu aufzubauen"""
+        for file_path, group in self._group_by_file(problems).items():
+            if file_path in self._groups:
+                self._insert_children(file_path, group)
+            else:
+                self._insert_file(file_path, group)
+    
+    def replace_file(self, file_path: str, problems: List[Problem]):
+        """Ersetzt die Probleme einer Datei; andere Gruppen bleiben unberührt"""
+        file_path = sys.intern(file_path)
+        if file_path not in self._groups:
+            if problems:
+                self._insert_file(file_path, list(problems))
+            return
+        
+        row = self._file_rows[file_path]
+        if not problems:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._files[row]
+            del self._groups[file_path]
+            self._file_rows = {path: i for i, path in enumerate(self._files)}
+            self.endRemoveRows()
+            return
+        
+        parent = self.index(row, 0)
+        old_count = len(self._groups[file_path])
+        self.beginRemoveRows(parent, 0, old_count - 1)
+        self._groups[file_path] = []
+        self.endRemoveRows()
+        self._insert_children(file_path, list(problems))
+    
+    @staticmethod
+    def _group_by_file(problems: List[Problem]) -> Dict[str, List[Problem]]:
+        """Gruppiert Probleme nach (interniertem) Dateipfad, Reihenfolge bleibt"""
+        groups: Dict[str, List[Problem]] = {}
+        for problem in problems:
+            groups.setdefault(sys.intern(problem.file_path), []).append(problem)
+        return groups
+    
+    def _insert_file(self, file_path: str, group: List[Problem]):
+        """Fügt eine neue Datei-Gruppe am Ende ein"""
+        row = len(self._files)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._files.append(file_path)
+        self._groups[file_path] = group
+        self._file_rows[file_path] = row
+        self.endInsertRows()
+    
+    def _insert_children(self, file_path: str, group: List[Problem]):
+        """Hängt Probleme an eine bestehende Datei-Gruppe an"""
+        row = self._file_rows[file_path]
+        parent = self.index(row, 0)
+        children = self._groups[file_path]
+        first = len(children)
+        self.beginInsertRows(parent, first, first + len(group) - 1)
+        children.extend(group)
+        self.endInsertRows()
+        self.dataChanged.emit(parent, parent)  # Anzahl im Datei-Label
+
+
+class ProblemsProxy(QSortFilterProxyModel):
+    """Filtert nach Schweregrad und Suchtext, ohne Zeilen neu zu erzeugen
+
+    Datei-Zeilen bleiben sichtbar, solange eines ihrer Probleme passt
+    (rekursives Filtern).
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setRecursiveFilteringEnabled(True)
+        self._severities: Optional[FrozenSet[ProblemSeverity]] = None  # None = alle
+        self._needle = ""
+    
+    def set_severities(self, severities: Optional[FrozenSet[ProblemSeverity]]):
+        """Setzt die erlaubten Schweregrade (None = alle)"""
+        self._change_filter('_severities', severities)
+    
+    def set_search_text(self, text: str):
+        """Setzt den Suchtext (Groß-/Kleinschreibung egal)"""
+        self._change_filter('_needle', text.lower())
+    
+    def _change_filter(self, attr: str, value):
+        """Ändert ein Filterkriterium und wertet die Zeilen neu aus"""
+        if getattr(self, attr) == value:
+            return
+        if hasattr(self, 'beginFilterChange'):  # Qt >= 6.9
+            self.beginFilterChange()
+            setattr(self, attr, value)
+            self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+        else:
+            setattr(self, attr, value)
+            self.invalidateRowsFilter()
+    
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        severities = self._severities
+        if not source_parent.isValid():
+            # Datei-Zeile: ohne Filter immer, sonst nur über passende Kinder
+            return severities is None and not self._needle
+        problem = self.sourceModel().problem(
+            self.sourceModel().index(source_row, 0, source_parent))
+        return ((severities is None or problem.severity in severities)
+                and (not self._needle or self._needle in problem.search_key))
 
 
 class ProblemsPanel(QWidget):
@@ -47,9 +320,20 @@ class ProblemsPanel(QWidget):
     
     problem_clicked = Signal(str, int, int)  # file, line, column
     
+    # Index des Filter-Combos -> erlaubte Schweregrade (None = alle)
+    _SEVERITY_FILTERS = (
+        None,
+        frozenset({ProblemSeverity.ERROR}),
+        frozenset({ProblemSeverity.WARNING}),
+        frozenset({ProblemSeverity.INFO, ProblemSeverity.HINT}),
+    )
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._problems: List[Problem] = []
+        self.model = ProblemsModel(self)
+        self.proxy = ProblemsProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self._severity_counts: Counter = Counter()  # laufend mitgeführt
         self._setup_ui()
     
     def _setup_ui(self):
@@ -96,27 +380,28 @@ class ProblemsPanel(QWidget):
         
         layout.addLayout(toolbar)
         
-        # Tree
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Problem", "Datei", "Zeile"])
+        # Tree (Modell/View: Filtern erzeugt keine Zeilen-Objekte)
+        self.tree = QTreeView()
+        self.tree.setModel(self.proxy)
         self.tree.setColumnWidth(0, 400)
         self.tree.setColumnWidth(1, 200)
         self.tree.setColumnWidth(2, 50)
-        self.tree.setRootIsDecorated(False)
+        self.tree.setRootIsDecorated(True)  # Datei-Gruppen aufklappbar
+        self.tree.setUniformRowHeights(True)  # nur sichtbare Zeilen vermessen/abfragen
         self.tree.setAlternatingRowColors(True)
-        self.tree.itemDoubleClicked.connect(self._on_item_clicked)
+        self.tree.doubleClicked.connect(self._on_item_clicked)
         
         self.tree.setStyleSheet("""
-            QTreeWidget {
+            QTreeView {
                 background-color: #1e1e1e;
                 color: #cccccc;
                 border: none;
                 alternate-background-color: #252526;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #094771;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: #2a2d2e;
             }
             QHeaderView::section {
@@ -131,112 +416,56 @@ class ProblemsPanel(QWidget):
     
     def add_problem(self, problem: Problem):
         """Fügt ein Problem hinzu"""
-        self._problems.append(problem)
-        self._update_display()
+        self.add_problems([problem])
     
     def add_problems(self, problems: List[Problem]):
         """Fügt mehrere Probleme hinzu"""
-        self._problems.extend(problems)
-        self._update_display()
+        self.model.add_problems(problems)
+        self._severity_counts.update(p.severity for p in problems)
+        self._update_counts()
     
     def set_problems(self, problems: List[Problem]):
         """Ersetzt alle Probleme"""
-        self._problems = problems
-        self._update_display()
+        self.model.set_problems(problems)
+        self._severity_counts = Counter(p.severity for p in problems)
+        self._update_counts()
     
     def clear(self):
         """Entfernt alle Probleme"""
-        self._problems.clear()
-        self._update_display()
+        self.set_problems([])
     
     def clear_file(self, file_path: str):
         """Entfernt alle Probleme einer Datei"""
-        self._problems = [p for p in self._problems if p.file_path != file_path]
-        self._update_display()
+        self.replace_file_problems(file_path, [])
     
-    def _update_display(self):
-        """Aktualisiert die Anzeige"""
-        self.tree.clear()
-        
-        # Zähler
-        errors = sum(1 for p in self._problems if p.severity == ProblemSeverity.ERROR)
-        warnings = sum(1 for p in self._problems if p.severity == ProblemSeverity.WARNING)
-        
-        self.error_count.setText(f"{errors} Fehler")
-        self.warning_count.setText(f"{warnings} Warnungen")
-        
-        # Gefilterte Liste
-        filtered = self._get_filtered_problems()
-        
-        for problem in filtered:
-            item = QTreeWidgetItem()
-            
-            # Icon basierend auf Schweregrad
-            severity_icons = {
-                ProblemSeverity.ERROR: "❌",
-                ProblemSeverity.WARNING: "⚠️",
-                ProblemSeverity.INFO: "ℹ️",
-                ProblemSeverity.HINT: "💡"
-            }
-            icon = severity_icons.get(problem.severity, "")
-            
-            # Text
-            message = f"{icon} {problem.message}"
-            if problem.code:
-                message += f" [{problem.code}]"
-            
-            item.setText(0, message)
-            item.setText(1, problem.file_path.split('\\')[-1] if '\\' in problem.file_path else problem.file_path.split('/')[-1])
-            item.setText(2, str(problem.line) if problem.line else "")
-            
-            # Farbe
-            colors = {
-                ProblemSeverity.ERROR: QColor("#f44747"),
-                ProblemSeverity.WARNING: QColor("#cca700"),
-                ProblemSeverity.INFO: QColor("#75beff"),
-                ProblemSeverity.HINT: QColor("#89d185")
-            }
-            item.setForeground(0, colors.get(problem.severity, QColor("#cccccc")))
-            
-            # Daten speichern
-            item.setData(0, Qt.ItemDataRole.UserRole, problem)
-            
-            self.tree.addTopLevelItem(item)
-    
-    def _get_filtered_problems(self) -> List[Problem]:
-        """Gibt gefilterte Probleme zurück"""
-        problems = self._problems
-        
-        # Schweregrad-Filter
-        filter_idx = self.filter_combo.currentIndex()
-        if filter_idx == 1:  # Fehler
-            problems = [p for p in problems if p.severity == ProblemSeverity.ERROR]
-        elif filter_idx == 2:  # Warnungen
-            problems = [p for p in problems if p.severity == ProblemSeverity.WARNING]
-        elif filter_idx == 3:  # Info
-            problems = [p for p in problems if p.severity in (ProblemSeverity.INFO, ProblemSeverity.HINT)]
-        
-        # Text-Filter
-        search = self.search_input.text().lower()
-        if search:
-            problems = [p for p in problems if search in p.message.lower() or search in p.file_path.lower()]
-        
-        return problems
+    def replace_file_problems(self, file_path: str, problems: List[Problem]):
+        """Ersetzt die Probleme einer Datei; nur deren Gruppe wird neu aufgebaut"""
+        removed = Counter(p.severity for p in self.model.file_problems(file_path))
+        self.model.replace_file(file_path, problems)
+        self._severity_counts.subtract(removed)
+        self._severity_counts.update(p.severity for p in problems)
+        self._update_counts()
+    
+    def _update_counts(self):
+        """Aktualisiert die Zähler"""
+        self.error_count.setText(f"{self.get_error_count()} Fehler")
+        self.warning_count.setText(f"{self.get_warning_count()} Warnungen")
     
     def _apply_filter(self):
         """Wendet Filter an"""
-        self._update_display()
+        self.proxy.set_severities(self._SEVERITY_FILTERS[self.filter_combo.currentIndex()])
+        self.proxy.set_search_text(self.search_input.text())
     
-    def _on_item_clicked(self, item: QTreeWidgetItem, column: int):
+    def _on_item_clicked(self, index: QModelIndex):
         """Behandelt Doppelklick auf Problem"""
-        problem = item.data(0, Qt.ItemDataRole.UserRole)
+        problem = index.data(Qt.ItemDataRole.UserRole)
         if problem:
             self.problem_clicked.emit(problem.file_path, problem.line, problem.column)
     
     def get_error_count(self) -> int:
         """Gibt Anzahl der Fehler zurück"""
-        return sum(1 for p in self._problems if p.severity == ProblemSeverity.ERROR)
+        return self._severity_counts[ProblemSeverity.ERROR]
     
     def get_warning_count(self) -> int:
         """Gibt Anzahl der Warnungen zurück"""
-        return sum(1 for p in self._problems if p.severity == ProblemSeverity.WARNING)
+        return self._severity_counts[ProblemSeverity.WARNING]
@@ -6,8 +6,15 @@ Basierend auf Entwicklerschleife V3
 """
 
 import os
+import re
 import asyncio
-from typing import Optional, List, Dict, Any, Callable, AsyncGenerator
+import atexit
+import functools
+import hashlib
+import importlib.util
+import weakref
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Callable, AsyncGenerator, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -52,6 +59,127 @@ class CodeGenerationResult:
     error: Optional[str] = None
 
 
+# Datei-Markierungen oder Python-Codeblöcke in Coder-Antworten, ein Durchlauf (_extract_files).
+# Codeblöcke dürfen keine Markierung enthalten, sonst würden sie diese verschlucken
+# (aufgerollte Schleife: nur an '#' und '`' wird vorausgeschaut).
+_FILE_OR_CODE_RE = re.compile(
+    r'#\s*===\s*DATEI:\s*(?P<name>.+?)\s*===\s*\n(?P<body>.*?)(?=#\s*===\s*DATEI:|$)'
+    r'|```python\n(?P<code>[^#`]*(?:(?:#(?!\s*===\s*DATEI:)|`(?!``))[^#`]*)*)```',
+    re.DOTALL
+)
+
+# Ein Client (und damit ein Verbindungspool) je Eventloop und API-Key, von allen
+# Instanzen geteilt; Verbindungen gehören zur Loop, auf der sie geöffnet wurden
+_CLIENT_CACHE: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]' = \
+    weakref.WeakKeyDictionary()
+
+# Verbindungsgrenzen des geteilten httpx-Pools
+_MAX_CONNECTIONS = 64
+_MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Gleichzeitige API-Anfragen je AIService (unter dem RPM/TPM-Limit bleiben)
+_MAX_CONCURRENCY = int(os.environ.get("DEVCENTER_MAX_CONCURRENCY", 8))
+
+# Wiederholungen bei 429/5xx: Wartezeit verdoppelt sich von 1 s bis höchstens 30 s
+_RETRY_ATTEMPTS = 5
+_RETRY_BASE_DELAY_S = 1.0
+_RETRY_MAX_DELAY_S = 30.0
+
+
+async def close_clients():
+    """Schließt die Clients der laufenden Eventloop (vor deren Ende aufrufen)"""
+    for client in _CLIENT_CACHE.pop(asyncio.get_running_loop(), {}).values():
+        try:
+            await client.close()
+        except Exception:
+            pass
+
+
+def _close_clients():
+    """Schließt beim Programmende die Clients noch offener Loops, jeweils auf ihrer Loop"""
+    for loop, clients in list(_CLIENT_CACHE.items()):
+        if loop.is_closed() or loop.is_running():
+            continue  # geschlossen: nicht mehr möglich; laufend: gehört einem anderen Thread
+        for client in clients.values():
+            try:
+                loop.run_until_complete(client.close())
+            except Exception:
+                pass
+    _CLIENT_CACHE.clear()
+
+
+atexit.register(_close_clients)
+
+
+# System-Prompts als Konstanten: identischer Präfix je Aufruf (Prompt-Caching der API)
+_SYSTEM_GENERATE = """Du bist ein erfahrener {language}-Entwickler.
+Generiere sauberen, gut dokumentierten Code basierend auf der Beschreibung.
+Füge Docstrings und Kommentare hinzu wo sinnvoll.
+Antworte NUR mit dem Code, ohne zusätzliche Erklärungen."""
+
+_SYSTEM_REVIEW = """Du bist ein erfahrener Code-Reviewer.
+Analysiere den Code auf:
+- Bugs und Fehler
+- Performance-Probleme
+- Best Practices
+- Sicherheitslücken
+- Lesbarkeit
+
+Gib konkrete Verbesserungsvorschläge."""
+
+_SYSTEM_FIX_ERROR = """Du bist ein Debugging-Experte.
+Analysiere den Fehler und gib eine korrigierte Version des Codes zurück.
+Erkläre kurz, was das Problem war."""
+
+_SYSTEM_EXPLAIN = """Du bist ein geduldiger Programmier-Lehrer.
+Erkläre den Code Schritt für Schritt auf verständliche Weise."""
+
+_SYSTEM_SUMMARY = """Fasse den folgenden Gesprächsverlauf zwischen Benutzer und Assistent
+knapp zusammen. Behalte Entscheidungen, Anforderungen, Dateinamen und
+wichtige Code-Details; lass Höflichkeiten und Wiederholungen weg."""
+
+_SYSTEM_PLANNER = """Du bist ein Software-Architekt.
+Erstelle einen strukturierten Entwicklungsplan mit:
+1. Übersicht der benötigten Komponenten
+2. Datenstrukturen und Klassen
+3. Wichtige Methoden und ihre Signaturen
+4. Abhängigkeiten und Imports
+5. Potentielle Herausforderungen
+
+Sei präzise und technisch."""
+
+_SYSTEM_CODER = """Du bist ein erfahrener Python-Entwickler.
+Implementiere den Code basierend auf dem Plan.
+- Schreibe sauberen, gut dokumentierten Code
+- Füge Type Hints hinzu
+- Behandle Fehler angemessen
+- Folge PEP 8
+
+Gib den Code in Markdown-Codeblöcken zurück.
+Wenn mehrere Dateien nötig sind, kennzeichne sie mit:
+# === DATEI: dateiname.py ==="""
+
+_SYSTEM_REVIEW_BUGS = """Du bist ein Code-Reviewer und QA-Experte.
+Prüfe den Code auf:
+1. Korrektheit
+2. Potentielle Bugs
+3. Best Practices
+
+Gib eine Bewertung (1-10) und konkrete Verbesserungsvorschläge."""
+
+_SYSTEM_REVIEW_SECURITY = """Du bist ein Sicherheitsexperte.
+Prüfe den Code auf Sicherheitslücken (Injection, unsichere Eingaben,
+Geheimnisse im Code, unsichere Dateizugriffe).
+
+Gib eine Bewertung (1-10) und konkrete Verbesserungsvorschläge."""
+
+_SYSTEM_REVIEW_PERF = """Du bist ein Performance-Experte.
+Prüfe den Code auf Performance-Probleme (Komplexität, unnötige
+Kopien, blockierende I/O, ineffiziente Datenstrukturen).
+
+Gib eine Bewertung (1-10) und konkrete Verbesserungsvorschläge."""
+
+
 class AIService:
     """
     AI-Service für Code-Generierung und Assistenz
@@ -73,28 +201,91 @@ class AIService:
         self.max_tokens = 4096
         self.temperature = 0.7
         self.conversation_history: List[AIMessage] = []
+        self.max_cache_entries = 128
+        # Verlauf über dieser Zeichenzahl wird bis auf die letzten Nachrichten zusammengefasst
+        self.history_char_limit = 24000
+        self.history_keep_messages = 4  # gerade Zahl: ganze Frage/Antwort-Paare
+        self.summary_model = AIModel.CLAUDE_HAIKU.value
         
-        self._client = None
         self._anthropic_available = False
+        # Antworten ohne Verlauf: sha256(model, max_tokens, system, prompt) -> AIResponse (LRU)
+        self._cache: 'OrderedDict[str, AIResponse]' = OrderedDict()
+        self._compact_task: Optional['asyncio.Task'] = None
+        # Eventloop -> Anfrage-Semaphore bzw. Verlaufs-Lock, bei Bedarf angelegt
+        self._loop_semaphores: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+        self._loop_locks: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
         
         try:
             import anthropic
             self._anthropic_available = True
-            if self.api_key:
-                self._client = anthropic.Anthropic(api_key=self.api_key)
         except ImportError:
             pass
     
+    @property
+    def _sem(self) -> asyncio.Semaphore:
+        """Begrenzt gleichzeitige API-Anfragen der laufenden Eventloop
+        
+        asyncio-Primitive sind an die Loop gebunden, auf der sie zuerst warten;
+        complete_sync startet je Aufruf eine eigene Loop.
+        """
+        loop = asyncio.get_running_loop()
+        sem = self._loop_semaphores.get(loop)
+        if sem is None:
+            sem = self._loop_semaphores[loop] = asyncio.Semaphore(max(1, _MAX_CONCURRENCY))
+        return sem
+    
+    @property
+    def _history_lock(self) -> asyncio.Lock:
+        """Lock für die Verlaufskompaktierung der laufenden Eventloop"""
+        loop = asyncio.get_running_loop()
+        lock = self._loop_locks.get(loop)
+        if lock is None:
+            lock = self._loop_locks[loop] = asyncio.Lock()
+        return lock
+    
+    @property
+    def _client(self):
+        """AsyncAnthropic-Client der laufenden Eventloop (nur in Coroutinen verwenden)"""
+        return self._get_client(self.api_key)
+    
+    @classmethod
+    def _get_client(cls, api_key: str):
+        """Gibt den geteilten AsyncAnthropic-Client für API-Key und laufende Eventloop zurück
+        
+        Alle Instanzen auf derselben Loop nutzen denselben httpx-Verbindungspool,
+        TLS-Handshakes fallen nur einmal je Verbindung an. Gepoolte Verbindungen
+        sind an ihre Loop gebunden, daher bekommt jede Loop eigene Clients.
+        
+        Raises:
+            RuntimeError: Ohne laufende Eventloop
+        """
+        clients = _CLIENT_CACHE.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(api_key)
+        if client is None:
+            import anthropic
+            # Limits-Klasse des vom SDK genutzten httpx (je nach Version httpx/httpx2)
+            limits_type = type(anthropic.DEFAULT_CONNECTION_LIMITS)
+            http_client = anthropic.DefaultAsyncHttpxClient(
+                limits=limits_type(
+                    max_connections=_MAX_CONNECTIONS,
+                    max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                http2=importlib.util.find_spec('h2') is not None  # HTTP/2 nur mit h2-Paket
+            )
+            # Wiederholungen übernimmt _with_retry; SDK-Retries würden sich damit multiplizieren
+            client = anthropic.AsyncAnthropic(
+                api_key=api_key, http_client=http_client, max_retries=0
+            )
+            clients[api_key] = client
+        return client
+    
     def is_available(self) -> bool:
         """Prüft ob der Service verfügbar ist"""
         return self._anthropic_available and bool(self.api_key)
     
     def set_api_key(self, api_key: str):
-        """Setzt den API-Key"""
+        """Setzt den API-Key (Clients werden je Eventloop bei Bedarf erzeugt und geteilt)"""
         self.api_key = api_key
-        if self._anthropic_available and api_key:
-            import anthropic
-            self._client = anthropic.Anthropic(api_key=api_key)
     
     def set_model(self, model: AIModel):
         """Setzt das zu verwendende Modell"""
@@ -102,12 +293,105 @@ class AIService:
     
     def clear_history(self):
         """Löscht den Konversationsverlauf"""
-        self.conversation_history.clear()
+        self.conversation_history.clear()  # laufende Zusammenfassung verwirft sich selbst
+    
+    def clear_cache(self):
+        """Löscht den Antwort-Cache"""
+        self._cache.clear()
+    
+    def _cache_key(self, prompt: str, system: Optional[str]) -> str:
+        """Schlüssel für den Antwort-Cache"""
+        raw = "\0".join((self.model, str(self.max_tokens), system or "", prompt))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _build_request(self, prompt: str, system: str, use_history: bool) -> Dict[str, Any]:
+        """Stellt die Parameter für messages.create/stream zusammen"""
+        messages = []
+        memo = ""
+        
+        if use_history:
+            for msg in self.conversation_history:
+                if msg.role == "system":
+                    memo = msg.content  # Zusammenfassung älterer Nachrichten
+                    continue
+                messages.append({
+                    "role": msg.role,
+                    "content": msg.content
+                })
+        
+        messages.append({
+            "role": "user",
+            "content": prompt
+        })
+        
+        kwargs = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": messages
+        }
+        
+        system_blocks = []
+        if system:
+            # Als Cache-Block markiert: wiederholte System-Prompts rechnet die API nicht neu
+            system_blocks.append({
+                "type": "text",
+                "text": system,
+                "cache_control": {"type": "ephemeral"}
+            })
+        if memo:
+            # Nach dem Cache-Block, damit eine neue Zusammenfassung den Cache nicht bricht
+            system_blocks.append({
+                "type": "text",
+                "text": f"Zusammenfassung des bisherigen Gesprächs:\n{memo}"
+            })
+        if system_blocks:
+            kwargs["system"] = system_blocks
+        
+        return kwargs
+    
+    def _record_history(self, prompt: str, content: str, use_history: bool):
+        """Übernimmt Anfrage und Antwort in den Verlauf"""
+        if use_history:
+            self.conversation_history.append(AIMessage("user", prompt))
+            self.conversation_history.append(AIMessage("assistant", content))
+            
+            history_chars = sum(len(msg.content) for msg in self.conversation_history)
+            if history_chars > self.history_char_limit and not (
+                    self._compact_task and not self._compact_task.done()):
+                # Im Hintergrund zusammenfassen, die Antwort wartet nicht darauf
+                self._compact_task = asyncio.get_running_loop().create_task(self._compact_history())
+    
+    async def _compact_history(self):
+        """Ersetzt ältere Nachrichten durch eine kurze Zusammenfassung (günstiges Modell)"""
+        async with self._history_lock:
+            old = self.conversation_history[:-self.history_keep_messages]
+            if not old:
+                return
+            
+            transcript = "\n\n".join(f"{msg.role}: {msg.content}" for msg in old)
+            try:
+                response = await self._with_retry(functools.partial(
+                    self._client.messages.create,
+                    model=self.summary_model,
+                    max_tokens=1024,
+                    system=_SYSTEM_SUMMARY,
+                    messages=[{"role": "user", "content": transcript}]
+                ))
+            except Exception:
+                return  # Verlauf bleibt vollständig
+            summary = response.content[0].text if response.content else ""
+            
+            # Verlauf könnte inzwischen geleert worden sein
+            if not summary or self.conversation_history[:len(old)] != old:
+                return
+            self.conversation_history[:len(old)] = [AIMessage("system", summary)]
     
     async def complete(self, 
                        prompt: str,
                        system: str = None,
-                       use_history: bool = True) -> AIResponse:
+                       use_history: bool = True,
+                       stream_callback: Callable[[str], None] = None,
+                       cache: bool = True) -> AIResponse:
         """
         Sendet eine Anfrage an die Claude API
         
@@ -115,6 +399,8 @@ class AIService:
             prompt: Die Benutzer-Nachricht
             system: Optionaler System-Prompt
             use_history: Konversationsverlauf einbeziehen
+            stream_callback: Erhält die Antwort stückweise, sobald sie eintrifft
+            cache: Gleiche Anfrage ohne Verlauf aus dem Cache beantworten
             
         Returns:
             AIResponse mit Ergebnis
@@ -126,53 +412,48 @@ class AIService:
                 error="AI-Service nicht verfügbar. API-Key prüfen oder anthropic installieren."
             )
         
+        # Ohne Verlauf hängt die Antwort nur von Modell, System-Prompt und Prompt ab
+        cache_key = self._cache_key(prompt, system) if cache and not use_history else None
+        if cache_key is not None and cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            cached = self._cache[cache_key]
+            if stream_callback is not None:
+                stream_callback(cached.content)
+            return cached
+        
         try:
-            # Nachrichten zusammenstellen
-            messages = []
-            
-            if use_history:
-                for msg in self.conversation_history:
-                    messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-            
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
+            kwargs = self._build_request(prompt, system, use_history)
             
-            # API-Aufruf
-            kwargs = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "messages": messages
-            }
-            
-            if system:
-                kwargs["system"] = system
-            
-            # Synchroner Aufruf (anthropic SDK ist nicht async)
-            response = await asyncio.to_thread(
-                self._client.messages.create,
-                **kwargs
-            )
+            if stream_callback is not None:
+                # Streaming: Text-Deltas sofort weiterreichen
+                streamed = False
+                
+                async def request():
+                    nonlocal streamed
+                    async with self._client.messages.stream(**kwargs) as stream:
+                        async for text in stream.text_stream:
+                            streamed = True
+                            stream_callback(text)
+                        return await stream.get_final_message()
+                
+                # Nach den ersten Deltas nicht wiederholen (sonst doppelter Text)
+                response = await self._with_retry(request, lambda: not streamed)
+            else:
+                response = await self._with_retry(
+                    functools.partial(self._client.messages.create, **kwargs)
+                )
             
-            content = response.content[0].text if response.content else ""
+            result = self._to_response(response)
             
             # Verlauf aktualisieren
-            if use_history:
-                self.conversation_history.append(AIMessage("user", prompt))
-                self.conversation_history.append(AIMessage("assistant", content))
+            self._record_history(prompt, result.content, use_history)
             
-            return AIResponse(
-                content=content,
-                model=response.model,
-                usage={
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens
-                }
-            )
+            if cache_key is not None:
+                self._cache[cache_key] = result
+                if len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)  # ältester Eintrag
+            
+            return result
             
         except Exception as e:
             return AIResponse(
@@ -181,14 +462,146 @@ class AIService:
                 error=str(e)
             )
     
+    async def _with_retry(self, request: Callable[[], Any],
+                          can_retry: Callable[[], bool] = None) -> Any:
+        """
+        Führt eine API-Anfrage aus: höchstens _MAX_CONCURRENCY gleichzeitig,
+        bei 429/5xx bis zu _RETRY_ATTEMPTS Versuche mit exponentiellem Backoff
+        
+        Args:
+            request: Erzeugt bei jedem Aufruf die Anfrage-Coroutine
+            can_retry: Optional; False verhindert weitere Versuche
+        """
+        delay = _RETRY_BASE_DELAY_S
+        for attempt in range(1, _RETRY_ATTEMPTS + 1):
+            try:
+                async with self._sem:
+                    return await request()
+            except Exception as e:
+                if (attempt == _RETRY_ATTEMPTS or not self._is_retryable(e)
+                        or (can_retry is not None and not can_retry())):
+                    raise
+            # Warten ohne Slot, andere Anfragen laufen weiter
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RETRY_MAX_DELAY_S)
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Rate-Limit (429) und Serverfehler (5xx, auch 529 Overloaded)"""
+        status = getattr(error, 'status_code', None)
+        return isinstance(status, int) and (status == 429 or status >= 500)
+    
+    async def stream(self,
+                     prompt: str,
+                     system: str = None,
+                     use_history: bool = True) -> AsyncGenerator[str, None]:
+        """
+        Liefert die Antwort Stück für Stück, sobald sie eintrifft
+        
+        Args:
+            prompt: Die Benutzer-Nachricht
+            system: Optionaler System-Prompt
+            use_history: Konversationsverlauf einbeziehen
+            
+        Yields:
+            Text-Deltas der Antwort
+        
+        Raises:
+            RuntimeError: Wenn der Service nicht verfügbar ist
+        """
+        if not self.is_available():
+            raise RuntimeError("AI-Service nicht verfügbar. API-Key prüfen oder anthropic installieren.")
+        
+        kwargs = self._build_request(prompt, system, use_history)
+        async with self._sem, self._client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                yield text
+            message = await stream.get_final_message()
+        
+        content = message.content[0].text if message.content else ""
+        self._record_history(prompt, content, use_history)
+    
+    @staticmethod
+    def _to_response(message) -> AIResponse:
+        """Wandelt eine API-Message in eine AIResponse"""
+        return AIResponse(
+            content=message.content[0].text if message.content else "",
+            model=message.model,
+            usage={
+                "input_tokens": message.usage.input_tokens,
+                "output_tokens": message.usage.output_tokens
+            }
+        )
+    
+    def batch_request(self, custom_id: str, prompt: str, system: str = None) -> Dict[str, Any]:
+        """Baut einen Eintrag für submit_batch (ohne Verlauf)"""
+        return {"custom_id": custom_id, "params": self._build_request(prompt, system, False)}
+    
+    async def submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """
+        Reicht Anfragen über die Message Batches API ein (halber Preis, Ergebnis
+        meist innerhalb einer Stunde)
+        
+        Args:
+            requests: Einträge {"custom_id": ..., "params": {...}}, z.B. aus batch_request()
+            
+        Returns:
+            ID des Batches
+        
+        Raises:
+            RuntimeError: Wenn der Service nicht verfügbar ist
+        """
+        if not self.is_available():
+            raise RuntimeError("AI-Service nicht verfügbar. API-Key prüfen oder anthropic installieren.")
+        
+        batch = await self._client.messages.batches.create(requests=requests)
+        return batch.id
+    
+    async def await_batch(self, batch_id: str,
+                          poll_interval: float = 10.0,
+                          max_poll_interval: float = 300.0) -> Dict[str, AIResponse]:
+        """
+        Wartet auf einen Batch und lädt die Ergebnisse
+        
+        Args:
+            batch_id: ID aus submit_batch()
+            poll_interval: Erste Wartezeit zwischen zwei Abfragen (Sekunden)
+            max_poll_interval: Obergrenze der verdoppelten Wartezeit
+            
+        Returns:
+            custom_id -> AIResponse (fehlgeschlagene Einträge mit error)
+        """
+        delay = poll_interval
+        while True:
+            batch = await self._client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)  # exponentielles Backoff
+        
+        responses: Dict[str, AIResponse] = {}
+        async for entry in await self._client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                responses[entry.custom_id] = self._to_response(result.message)
+            else:
+                error = getattr(result, 'error', None)
+                responses[entry.custom_id] = AIResponse(
+                    content="",
+                    model=self.model,
+                    error=f"{result.type}: {error}" if error else result.type
+                )
+        return responses
+    
     def complete_sync(self,
                       prompt: str,
                       system: str = None,
                       use_history: bool = True) -> AIResponse:
-        """Synchrone Version von complete() -- Python 3.10+ sicher (kein asyncio.run im GUI-Thread).
+        """Synchrone Version von complete() (z.B. für CLI-Aufrufe).
 
-        Erstellt stets einen neuen Event-Loop in einem eigenen Thread,
-        um RuntimeError bei bereits laufendem Loop (PySide6 GUI) zu vermeiden.
+        Ohne laufende Eventloop direkt per asyncio.run; läuft im aktuellen
+        Thread bereits eine Loop (PySide6/qasync), in einem eigenen Thread,
+        um RuntimeError zu vermeiden.
 
         Args:
             prompt: Eingabe-Text
@@ -198,19 +611,29 @@ class AIService:
         Returns:
             AIResponse mit Ergebnis oder Fehler
         """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._complete_once(prompt, system, use_history))
+        
         import concurrent.futures
-
-        def _run_in_new_loop() -> AIResponse:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(self.complete(prompt, system, use_history))
-            finally:
-                loop.close()
-                asyncio.set_event_loop(None)
-
         with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-            return pool.submit(_run_in_new_loop).result()
+            return pool.submit(
+                asyncio.run, self._complete_once(prompt, system, use_history)
+            ).result()
+    
+    async def _complete_once(self, prompt: str, system: str, use_history: bool) -> AIResponse:
+        """complete() auf einer kurzlebigen Loop; schließt danach deren Clients
+        
+        Eine angestoßene Verlaufskompaktierung wird abgewartet, asyncio.run
+        würde sie beim Beenden der Loop sonst abbrechen.
+        """
+        try:
+            return await self.complete(prompt, system, use_history)
+        finally:
+            if self._compact_task is not None and not self._compact_task.done():
+                await asyncio.gather(self._compact_task, return_exceptions=True)
+            await close_clients()
     
     async def generate_code(self,
                            description: str,
@@ -227,10 +650,7 @@ class AIService:
         Returns:
             AIResponse mit generiertem Code
         """
-        system = f"""Du bist ein erfahrener {language}-Entwickler.
-Generiere sauberen, gut dokumentierten Code basierend auf der Beschreibung.
-Füge Docstrings und Kommentare hinzu wo sinnvoll.
-Antworte NUR mit dem Code, ohne zusätzliche Erklärungen."""
+        system = _SYSTEM_GENERATE.format(language=language)
         
         prompt = f"""Generiere {language}-Code für folgende Anforderung:
 
@@ -258,23 +678,13 @@ Bestehender Kontext/Code:
         Returns:
             AIResponse mit Review
         """
-        system = """Du bist ein erfahrener Code-Reviewer.
-Analysiere den Code auf:
-- Bugs und Fehler
-- Performance-Probleme
-- Best Practices
-- Sicherheitslücken
-- Lesbarkeit
-
-Gib konkrete Verbesserungsvorschläge."""
-        
         prompt = f"""Bitte reviewe folgenden {language}-Code:
 
 ```{language}
 {code}
 ```"""
         
-        return await self.complete(prompt, system, use_history=False)
+        return await self.complete(prompt, _SYSTEM_REVIEW, use_history=False)
     
     async def fix_error(self, 
                         code: str, 
@@ -291,10 +701,6 @@ Gib konkrete Verbesserungsvorschläge."""
         Returns:
             AIResponse mit Korrektur
         """
-        system = """Du bist ein Debugging-Experte.
-Analysiere den Fehler und gib eine korrigierte Version des Codes zurück.
-Erkläre kurz, was das Problem war."""
-        
         prompt = f"""Folgender {language}-Code erzeugt einen Fehler:
 
 ```{language}
@@ -308,7 +714,7 @@ Fehlermeldung:
 
 Bitte korrigiere den Code."""
         
-        return await self.complete(prompt, system, use_history=False)
+        return await self.complete(prompt, _SYSTEM_FIX_ERROR, use_history=False)
     
     async def explain_code(self, code: str, language: str = "python") -> AIResponse:
         """
@@ -321,16 +727,13 @@ Bitte korrigiere den Code."""
         Returns:
             AIResponse mit Erklärung
         """
-        system = """Du bist ein geduldiger Programmier-Lehrer.
-Erkläre den Code Schritt für Schritt auf verständliche Weise."""
-        
         prompt = f"""Erkläre bitte folgenden {language}-Code:
 
 ```{language}
 {code}
 ```"""
         
-        return await self.complete(prompt, system, use_history=False)
+        return await self.complete(prompt, _SYSTEM_EXPLAIN, use_history=False)
 
 
 class DevelopmentLoop:
@@ -343,18 +746,36 @@ class DevelopmentLoop:
     3. Checker: Reviewt und validiert
     """
     
+    # Teil-Reviews der Checker-Phase: (Überschrift, System-Prompt)
+    REVIEW_ASPECTS = (
+        ("Korrektheit", _SYSTEM_REVIEW_BUGS),
+        ("Sicherheit", _SYSTEM_REVIEW_SECURITY),
+        ("Performance", _SYSTEM_REVIEW_PERF),
+    )
+    
     def __init__(self, ai_service: AIService):
         self.ai = ai_service
         self.progress_callback: Optional[Callable[[str, int], None]] = None
+        self.stream_callback: Optional[Callable[[str, str], None]] = None
     
     def set_progress_callback(self, callback: Callable[[str, int], None]):
         """Setzt Callback für Fortschrittsupdates (phase, progress)"""
         self.progress_callback = callback
     
+    def set_stream_callback(self, callback: Callable[[str, str], None]):
+        """Setzt Callback für Teilantworten während einer Phase (phase, text)"""
+        self.stream_callback = callback
+    
     def _emit_progress(self, phase: str, progress: int):
         if self.progress_callback:
             self.progress_callback(phase, progress)
     
+    def _partial_callback(self, phase: str) -> Optional[Callable[[str], None]]:
+        """Callback für complete(), der Teilantworten der Phase weiterreicht"""
+        if self.stream_callback is None:
+            return None
+        return functools.partial(self.stream_callback, phase)
+    
     async def run(self, 
                   task_description: str,
                   project_context: str = "",
@@ -395,12 +816,16 @@ class DevelopmentLoop:
                 return result
             
             result.code = code_response.content
-            result.files = self._extract_files(result.code)
             self._emit_progress("coding", 70)
             
-            # Phase 3: Checker
+            # Phase 3: Checker; Dateien werden währenddessen im Executor extrahiert
             self._emit_progress("checking", 80)
-            review_response = await self._run_checker(result.code)
+            files_future = asyncio.get_running_loop().run_in_executor(
+                None, self._extract_files, result.code
+            )
+            review_response, result.files = await asyncio.gather(
+                self._run_checker(result.code), files_future
+            )
             
             if not review_response.success:
                 result.success = False
@@ -417,18 +842,106 @@ class DevelopmentLoop:
             result.error = str(e)
             return result
     
-    async def _run_planner(self, task: str, context: str) -> AIResponse:
-        """Phase 1: Architektur planen"""
-        system = """Du bist ein Software-Architekt.
-Erstelle einen strukturierten Entwicklungsplan mit:
-1. Übersicht der benötigten Komponenten
-2. Datenstrukturen und Klassen
-3. Wichtige Methoden und ihre Signaturen
-4. Abhängigkeiten und Imports
-5. Potentielle Herausforderungen
-
-Sei präzise und technisch."""
+    async def run_many(self,
+                       tasks: List[str],
+                       project_context: str = "",
+                       mode: str = "batch") -> List[CodeGenerationResult]:
+        """
+        Führt die Entwicklerschleife für viele Aufgaben aus
+        
+        Args:
+            tasks: Aufgabenbeschreibungen
+            project_context: Kontext zum Projekt (für alle Aufgaben)
+            mode: "batch" = je Phase ein Message Batch (halber Preis, kann
+                bis zu Stunden dauern), sonst parallele Einzelläufe
+            
+        Returns:
+            Ein CodeGenerationResult je Aufgabe (gleiche Reihenfolge)
+        """
+        if mode != "batch":
+            return list(await asyncio.gather(*(self.run(task, project_context) for task in tasks)))
+        
+        results = [CodeGenerationResult() for _ in tasks]
+        active = list(range(len(tasks)))
         
+        try:
+            # Phase 1: Planner
+            self._emit_progress("planning", 10)
+            responses = await self._run_batch({
+                f"task-{i}": (self._planner_prompt(tasks[i], project_context), _SYSTEM_PLANNER)
+                for i in active
+            })
+            active = self._apply_batch_phase(results, active, responses, "plan", "Planner")
+            
+            # Phase 2: Coder
+            self._emit_progress("coding", 40)
+            responses = await self._run_batch({
+                f"task-{i}": (self._coder_prompt(results[i].plan, project_context), _SYSTEM_CODER)
+                for i in active
+            })
+            active = self._apply_batch_phase(results, active, responses, "code", "Coder")
+            
+            # Phase 3: Checker (alle Teil-Reviews in einem Batch)
+            self._emit_progress("checking", 80)
+            responses = await self._run_batch({
+                f"task-{i}-{n}": (self._review_prompt(results[i].code), system)
+                for i in active
+                for n, (_, system) in enumerate(self.REVIEW_ASPECTS)
+            })
+            for i in active:
+                results[i].files = self._extract_files(results[i].code)
+                review = self._merge_reviews([
+                    (aspect, self._batch_response(responses, f"task-{i}-{n}"))
+                    for n, (aspect, _) in enumerate(self.REVIEW_ASPECTS)
+                ])
+                if review.success:
+                    results[i].review = review.content
+                else:
+                    results[i].success = False
+                    results[i].error = f"Checker-Fehler: {review.error}"
+            
+            self._emit_progress("complete", 100)
+            
+        except Exception as e:
+            for i in active:
+                results[i].success = False
+                results[i].error = str(e)
+        
+        return results
+    
+    async def _run_batch(self, prompts: Dict[str, Tuple[str, str]]) -> Dict[str, AIResponse]:
+        """Reicht custom_id -> (prompt, system) als Batch ein und wartet auf das Ergebnis"""
+        if not prompts:
+            return {}
+        batch_id = await self.ai.submit_batch([
+            self.ai.batch_request(custom_id, prompt, system)
+            for custom_id, (prompt, system) in prompts.items()
+        ])
+        return await self.ai.await_batch(batch_id)
+    
+    def _batch_response(self, responses: Dict[str, AIResponse], custom_id: str) -> AIResponse:
+        """Ergebnis eines Batch-Eintrags (fehlend = Fehler)"""
+        return responses.get(custom_id) or AIResponse(
+            content="", model=self.ai.model, error="Kein Ergebnis im Batch"
+        )
+    
+    def _apply_batch_phase(self, results: List[CodeGenerationResult], active: List[int],
+                           responses: Dict[str, AIResponse], attr: str, label: str) -> List[int]:
+        """Übernimmt die Antworten einer Batch-Phase; gibt die weiterhin aktiven Aufgaben zurück"""
+        still_active = []
+        for i in active:
+            response = self._batch_response(responses, f"task-{i}")
+            if response.success:
+                setattr(results[i], attr, response.content)
+                still_active.append(i)
+            else:
+                results[i].success = False
+                results[i].error = f"{label}-Fehler: {response.error}"
+        return still_active
+    
+    @staticmethod
+    def _planner_prompt(task: str, context: str) -> str:
+        """Prompt für Phase 1"""
         prompt = f"""Erstelle einen Entwicklungsplan für:
 
 {task}
@@ -438,22 +951,11 @@ Sei präzise und technisch."""
 Projektkontext:
 {context}
 """
-        
-        return await self.ai.complete(prompt, system, use_history=False)
+        return prompt
     
-    async def _run_coder(self, plan: str, context: str) -> AIResponse:
-        """Phase 2: Code implementieren"""
-        system = """Du bist ein erfahrener Python-Entwickler.
-Implementiere den Code basierend auf dem Plan.
-- Schreibe sauberen, gut dokumentierten Code
-- Füge Type Hints hinzu
-- Behandle Fehler angemessen
-- Folge PEP 8
-
-Gib den Code in Markdown-Codeblöcken zurück.
-Wenn mehrere Dateien nötig sind, kennzeichne sie mit:
-# === DATEI: dateiname.py ==="""
-        
+    @staticmethod
+    def _coder_prompt(plan: str, context: str) -> str:
+        """Prompt für Phase 2"""
         prompt = f"""Implementiere folgenden Plan:
 
 {plan}
@@ -463,59 +965,95 @@ Wenn mehrere Dateien nötig sind, kennzeichne sie mit:
 Zu berücksichtigen:
 {context}
 """
-        
-        return await self.ai.complete(prompt, system, use_history=False)
+        return prompt
     
-    async def _run_checker(self, code: str) -> AIResponse:
-        """Phase 3: Code reviewen"""
-        system = """Du bist ein Code-Reviewer und QA-Experte.
-Prüfe den Code auf:
-1. Korrektheit
-2. Best Practices
-3. Potentielle Bugs
-4. Performance
-5. Sicherheit
-
-Gib eine Bewertung (1-10) und konkrete Verbesserungsvorschläge."""
-        
-        prompt = f"""Reviewe folgenden Code:
+    @staticmethod
+    def _review_prompt(code: str) -> str:
+        """Prompt für die Teil-Reviews in Phase 3"""
+        return f"""Reviewe folgenden Code:
 
 {code}
 """
+    
+    async def _run_planner(self, task: str, context: str) -> AIResponse:
+        """Phase 1: Architektur planen"""
+        return await self.ai.complete(self._planner_prompt(task, context), _SYSTEM_PLANNER,
+                                      use_history=False,
+                                      stream_callback=self._partial_callback("planning"),
+                                      cache=False)
+    
+    async def _run_coder(self, plan: str, context: str) -> AIResponse:
+        """Phase 2: Code implementieren"""
+        return await self.ai.complete(self._coder_prompt(plan, context), _SYSTEM_CODER,
+                                      use_history=False,
+                                      stream_callback=self._partial_callback("coding"),
+                                      cache=False)
+    
+    async def _run_checker(self, code: str) -> AIResponse:
+        """Phase 3: Code reviewen (Teil-Reviews laufen parallel)"""
+        reviews = await asyncio.gather(
+            self._review_bugs(code),
+            self._review_security(code),
+            self._review_perf(code)
+        )
+        return self._merge_reviews(reviews)
+    
+    async def _review(self, aspect: str, system: str, code: str) -> Tuple[str, AIResponse]:
+        """Ein Teil-Review; Teilantworten laufen unter 'checking:<aspect>'"""
+        response = await self.ai.complete(self._review_prompt(code), system, use_history=False,
+                                          stream_callback=self._partial_callback(f"checking:{aspect}"))
+        return aspect, response
+    
+    async def _review_bugs(self, code: str) -> Tuple[str, AIResponse]:
+        """Teil-Review: Korrektheit, Bugs und Best Practices"""
+        return await self._review(*self.REVIEW_ASPECTS[0], code)
+    
+    async def _review_security(self, code: str) -> Tuple[str, AIResponse]:
+        """Teil-Review: Sicherheit"""
+        return await self._review(*self.REVIEW_ASPECTS[1], code)
+    
+    async def _review_perf(self, code: str) -> Tuple[str, AIResponse]:
+        """Teil-Review: Performance"""
+        return await self._review(*self.REVIEW_ASPECTS[2], code)
+    
+    def _merge_reviews(self, reviews: List[Tuple[str, AIResponse]]) -> AIResponse:
+        """Fasst die Teil-Reviews zu einer Antwort zusammen"""
+        errors = [f"{aspect}: {response.error}" for aspect, response in reviews if not response.success]
+        usage: Dict[str, int] = {}
+        for _, response in reviews:
+            for key, value in response.usage.items():
+                usage[key] = usage.get(key, 0) + value
         
-        return await self.ai.complete(prompt, system, use_history=False)
+        return AIResponse(
+            content="\n\n".join(f"## {aspect}\n\n{response.content}"
+                                for aspect, response in reviews if response.success),
+            model=reviews[0][1].model,
+            usage=usage,
+            error="; ".join(errors) if errors else None
+        )
     
     def _extract_files(self, code: str) -> List[Dict[str, str]]:
         """Extrahiert Dateien aus der Code-Antwort"""
         files = []
+        code_blocks = []
         
-        # Nach Datei-Markierungen suchen
-        import re
-        pattern = r'#\s*===\s*DATEI:\s*(.+?)\s*===\s*\n(.*?)(?=#\s*===\s*DATEI:|$)'
-        matches = re.findall(pattern, code, re.DOTALL)
-        
-        if matches:
-            for filename, content in matches:
+        # Datei-Markierungen und Markdown-Codeblöcke in einem Durchlauf suchen
+        for match in _FILE_OR_CODE_RE.finditer(code):
+            if match.group('name') is not None:
                 files.append({
-                    'filename': filename.strip(),
-                    'content': content.strip()
+                    'filename': match.group('name').strip(),
+                    'content': match.group('body').strip()
                 })
-        else:
+            elif not files:
+                code_blocks.append(match.group('code'))
+        
+        if not files:
             # Kein Multi-File Format, Code als einzelne Datei
-            # Versuche Code aus Markdown zu extrahieren
-            code_pattern = r'```python\n(.*?)```'
-            code_matches = re.findall(code_pattern, code, re.DOTALL)
-            
-            if code_matches:
-                files.append({
-                    'filename': 'generated_code.py',
-                    'content': '\n\n'.join(code_matches)
-                })
-            else:
-                files.append({
-                    'filename': 'generated_code.py',
-                    'content': code
-                })
+            # (aus Markdown-Codeblöcken, sonst die ganze Antwort)
+            files.append({
+                'filename': 'generated_code.py',
+                'content': '\n\n'.join(code_blocks) if code_blocks else code
+            })
         
         return files
 
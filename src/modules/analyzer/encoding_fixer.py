@@ -6,8 +6,15 @@ Basierend auf EncodingFixer mit ftfy
 """
 
 import os
+import json
+import sqlite3
+import asyncio
+import itertools
+import shutil
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union, Dict
 import chardet
 
 
@@ -16,8 +23,9 @@ class EncodingFixer:
     Erkennt und repariert Encoding-Probleme
     
     Verwendet:
-    - chardet für Encoding-Erkennung
+    - charset-normalizer für Encoding-Erkennung (optional, sonst chardet)
     - ftfy für Text-Reparatur (optional)
+    - aiofiles für asynchrones Lesen (optional)
     """
     
     COMMON_ENCODINGS = [
@@ -29,28 +37,101 @@ class EncodingFixer:
         'ascii'
     ]
     
-    def __init__(self):
+    # Gleichzeitig offene Dateien in check_directory_async
+    MAX_CONCURRENT_READS = 64
+    # Ab dieser Anzahl Nicht-UTF-8-Dateien lohnt sich ein Prozess-Pool für chardet
+    PARALLEL_MIN_FILES = 16
+    # Puffergröße beim zeilenweisen Umkodieren in fix_file
+    STREAM_BUFFER_SIZE = 1 << 20
+    
+    def __init__(self, max_detect_bytes: int = 65536, index_path: str = None):
+        """
+        Args:
+            max_detect_bytes: Nur so viele Bytes vom Dateianfang an die Erkennung geben
+            index_path: SQLite-Index der Prüfergebnisse für check_directory
+                (Standard: DevCenter-Verzeichnis in APPDATA bzw. Home)
+        """
+        self.max_detect_bytes = max_detect_bytes
+        self.index_path = index_path
+        # Pfad -> ((st_mtime_ns, st_size), Ergebnis als JSON); beim ersten Zugriff geladen
+        self._index: Optional[Dict[str, Tuple[Tuple[int, int], str]]] = None
+        
         self._ftfy_available = False
         try:
             import ftfy
             self._ftfy_available = True
         except ImportError:
             pass
+        
+        self._charset_normalizer_available = False
+        try:
+            import charset_normalizer
+            self._charset_normalizer_available = True
+        except ImportError:
+            pass
+        
+        self._aiofiles_available = False
+        try:
+            import aiofiles
+            self._aiofiles_available = True
+        except ImportError:
+            pass
+    
+    @staticmethod
+    def _load(file_path: str) -> bytes:
+        """Liest eine Datei einmalig als Bytes"""
+        with open(file_path, 'rb') as f:
+            return f.read()
     
-    def detect_encoding(self, file_path: str) -> Tuple[str, float]:
+    @staticmethod
+    def _utf8_encoding(raw: bytes, final: bool = True) -> Optional[str]:
+        """'utf-8-sig' bzw. 'utf-8' wenn der Inhalt gültiges UTF-8 ist, sonst None
+        
+        Mit final=False ist raw ein Präfix; ein am Ende abgeschnittenes
+        Zeichen gilt dann nicht als Fehler.
         """
-        Erkennt das Encoding einer Datei
+        try:
+            raw.decode('utf-8')
+        except UnicodeDecodeError as e:
+            if final or e.reason != 'unexpected end of data':
+                return None
+        return 'utf-8-sig' if raw.startswith(b'\xef\xbb\xbf') else 'utf-8'
+    
+    def detect_encoding(self, data: Union[bytes, str]) -> Tuple[str, float]:
+        """
+        Erkennt das Encoding von Datei-Inhalt
         
         Args:
-            file_path: Pfad zur Datei
+            data: Bereits gelesene Bytes (oder Pfad zur Datei; dann wird
+                nur der Anfang bis max_detect_bytes gelesen)
             
         Returns:
             Tuple (encoding, confidence)
         """
-        with open(file_path, 'rb') as f:
-            raw_data = f.read()
+        complete = True
+        if isinstance(data, str):
+            with open(data, 'rb') as f:
+                data = f.read(self.max_detect_bytes)
+            complete = len(data) < self.max_detect_bytes
+        
+        # Schnellpfad: die meisten Dateien sind gültiges UTF-8 (Dekodieren in C)
+        encoding = self._utf8_encoding(data, final=complete)
+        if encoding:
+            return encoding, 1.0
+        
+        # Die Erkennung gewinnt über den Anfang hinaus kaum an Genauigkeit
+        return self._detect_bytes(data[:self.max_detect_bytes])
+    
+    def _detect_bytes(self, sample: bytes) -> Tuple[str, float]:
+        """Erkennt das Encoding von sample ohne UTF-8-Schnellpfad und Kürzung"""
+        # charset-normalizer ist deutlich schneller als das reine Python-chardet
+        if self._charset_normalizer_available:
+            from charset_normalizer import from_bytes
+            best = from_bytes(sample).best()
+            if best is not None:
+                return best.encoding, 1.0 - best.chaos  # chaos: 0.0 = sauberer Text
         
-        result = chardet.detect(raw_data)
+        result = chardet.detect(sample)
         return result.get('encoding', 'utf-8'), result.get('confidence', 0.0)
     
     def fix_file(self, file_path: str, 
@@ -67,39 +148,64 @@ class EncodingFixer:
         Returns:
             Tuple (success, message)
         """
+        tmp_path = file_path + '.tmp'
         try:
-            # Encoding erkennen
+            # Encoding aus dem Dateianfang erkennen, der Rest wird gestreamt
             source_encoding, confidence = self.detect_encoding(file_path)
             
             if not source_encoding:
                 return False, "Encoding konnte nicht erkannt werden"
             
-            # Datei lesen
-            with open(file_path, 'r', encoding=source_encoding, errors='replace') as f:
-                content = f.read()
-            
-            # Mit ftfy reparieren wenn verfügbar
-            if self._ftfy_available:
-                import ftfy
-                content = ftfy.fix_text(content)
-            
-            # Backup erstellen
+            # Backup vor dem Schreiben (Kopie, kein Einlesen)
             if backup:
-                backup_path = file_path + '.bak'
-                with open(file_path, 'rb') as f:
-                    original = f.read()
-                with open(backup_path, 'wb') as f:
-                    f.write(original)
+                shutil.copy2(file_path, file_path + '.bak')
+            
+            try:
+                # Das Encoding gilt nur für den Anfang als geprüft (z.B. 'ascii'
+                # bei reinem ASCII-Kopf): Rest strikt dekodieren
+                self._transcode(file_path, tmp_path, source_encoding, target_encoding)
+            except UnicodeDecodeError:
+                # Anfang nicht repräsentativ: Encoding über die ganze Datei bestimmen
+                raw = self._load(file_path)
+                source_encoding = self._utf8_encoding(raw)
+                if source_encoding is None:
+                    source_encoding, confidence = self._detect_bytes(raw)
+                if not source_encoding:
+                    raise
+                self._transcode(file_path, tmp_path, source_encoding, target_encoding)
             
-            # Mit neuem Encoding speichern
-            with open(file_path, 'w', encoding=target_encoding) as f:
-                f.write(content)
+            # Original erst nach vollständigem Schreiben ersetzen (atomar)
+            shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
             
             return True, f"Konvertiert: {source_encoding} → {target_encoding}"
             
         except Exception as e:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            if isinstance(e, UnicodeDecodeError):
+                # Nie mit Ersatzzeichen schreiben; Original bleibt unverändert
+                return False, f"Nicht verlustfrei dekodierbar ({e.encoding}): {e.reason}"
             return False, f"Fehler: {str(e)}"
     
+    def _transcode(self, src_path: str, dst_path: str, source_encoding: str,
+                   target_encoding: str, errors: str = 'strict'):
+        """Schreibt src_path zeilenweise umkodiert (und ggf. mit ftfy repariert) nach dst_path"""
+        fix_text = None
+        if self._ftfy_available:
+            import ftfy
+            fix_text = ftfy.fix_text
+        
+        # Textmodus mit newline=None vereinheitlicht die Zeilenenden auf \n
+        with open(src_path, 'r', encoding=source_encoding, errors=errors,
+                  buffering=self.STREAM_BUFFER_SIZE) as src, \
+                open(dst_path, 'w', encoding=target_encoding,
+                     buffering=self.STREAM_BUFFER_SIZE) as dst:
+            for line in src:
+                dst.write(fix_text(line) if fix_text else line)
+    
     def check_file(self, file_path: str) -> dict:
         """
         Prüft eine Datei auf Encoding-Probleme
@@ -110,7 +216,42 @@ class EncodingFixer:
         Returns:
             Dict mit Analyseergebnis
         """
-        result = {
+        try:
+            raw = self._load(file_path)
+        except Exception as e:
+            return self._error_result(file_path, e)
+        
+        return self._check_bytes(file_path, raw)
+    
+    async def check_file_async(self, file_path: str) -> dict:
+        """
+        Asynchrone Variante von check_file; liest die Datei nur einmal
+        
+        Args:
+            file_path: Pfad zur Datei
+            
+        Returns:
+            Dict mit Analyseergebnis
+        """
+        try:
+            raw = await self._load_async(file_path)
+        except Exception as e:
+            return self._error_result(file_path, e)
+        
+        return self._check_bytes(file_path, raw)
+    
+    async def _load_async(self, file_path: str) -> bytes:
+        """Liest eine Datei asynchron als Bytes (aiofiles oder Thread)"""
+        if self._aiofiles_available:
+            import aiofiles
+            async with aiofiles.open(file_path, 'rb') as f:
+                return await f.read()
+        return await asyncio.to_thread(Path(file_path).read_bytes)
+    
+    @staticmethod
+    def _empty_result(file_path: str) -> dict:
+        """Leeres Prüfergebnis für eine Datei"""
+        return {
             'path': file_path,
             'encoding': None,
             'confidence': 0.0,
@@ -118,25 +259,36 @@ class EncodingFixer:
             'has_bom': False,
             'issues': []
         }
+    
+    @classmethod
+    def _error_result(cls, file_path: str, error: Exception) -> dict:
+        """Prüfergebnis für eine nicht lesbare Datei"""
+        result = cls._empty_result(file_path)
+        result['issues'].append(f"Fehler: {str(error)}")
+        return result
+    
+    def _check_bytes(self, file_path: str, raw: bytes) -> dict:
+        """Prüft den bereits gelesenen Inhalt einer Datei"""
+        result = self._empty_result(file_path)
         
         try:
             # Encoding erkennen
-            encoding, confidence = self.detect_encoding(file_path)
+            utf8_encoding = self._utf8_encoding(raw)
+            if utf8_encoding:
+                encoding, confidence = utf8_encoding, 1.0
+            else:
+                encoding, confidence = self.detect_encoding(raw)
             result['encoding'] = encoding
             result['confidence'] = confidence
             
             # Als UTF-8 prüfen
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    f.read()
+            if utf8_encoding:
                 result['is_valid_utf8'] = True
-            except UnicodeDecodeError:
+            else:
                 result['issues'].append("Datei ist nicht valides UTF-8")
             
             # BOM prüfen
-            with open(file_path, 'rb') as f:
-                header = f.read(3)
-            if header.startswith(b'\xef\xbb\xbf'):
+            if raw.startswith(b'\xef\xbb\xbf'):
                 result['has_bom'] = True
                 result['issues'].append("Datei hat UTF-8 BOM")
             
@@ -161,17 +313,187 @@ class EncodingFixer:
         Returns:
             Liste von Prüfergebnissen
         """
-        if extensions is None:
-            extensions = ['.py', '.txt', '.md', '.json', '.xml', '.html']
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.check_directory_async(dir_path, extensions))
+        
+        # Aufruf aus laufender Eventloop: eigene Loop in einem Hilfsthread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(
+                asyncio.run, self.check_directory_async(dir_path, extensions)
+            ).result()
+    
+    async def check_directory_async(self, dir_path: str,
+                                    extensions: List[str] = None) -> List[dict]:
+        """
+        Prüft alle Dateien eines Verzeichnisses mit überlappenden Lesezugriffen
+        
+        Args:
+            dir_path: Pfad zum Verzeichnis
+            extensions: Zu prüfende Dateiendungen
+            
+        Returns:
+            Liste von Prüfergebnissen (Reihenfolge wie beim Durchlaufen)
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_READS)
+        pending: Dict[int, bytes] = {}  # Index -> Inhalt, braucht chardet
+        stamps: Dict[int, Tuple[int, int]] = {}  # Index -> (mtime_ns, size) geprüfter Dateien
         
-        results = []
-        path = Path(dir_path)
+        async def check(index: int, path: str) -> Optional[dict]:
+            async with semaphore:
+                try:
+                    raw = await self._load_async(path)
+                except Exception as e:
+                    return self._error_result(path, e)
+            if self._utf8_encoding(raw):
+                return self._check_bytes(path, raw)  # Schnellpfad, kein chardet
+            pending[index] = raw
+            return None
         
-        for file_path in path.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in extensions:
-                results.append(self.check_file(str(file_path)))
+        paths = self._collect_files(dir_path, extensions)
+        
+        # Unveränderte Dateien (gleiche mtime und Größe) direkt aus dem Index
+        known = self._load_index()
+        results: List[Optional[dict]] = [None] * len(paths)
+        for i, path in enumerate(paths):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Fehler meldet check()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            entry = known.get(self._index_key(path))
+            if entry is not None and entry[0] == stamp:
+                results[i] = json.loads(entry[1])
+                results[i]['path'] = path  # Schreibweise des Aufrufers
+            else:
+                stamps[i] = stamp
+        
+        todo = [i for i, result in enumerate(results) if result is None]
+        checked = await asyncio.gather(*(check(i, paths[i]) for i in todo))
+        for index, result in zip(todo, checked):
+            results[index] = result
+        
+        if pending:
+            # chardet ist CPU-gebunden: außerhalb der Eventloop, ggf. auf allen Kernen
+            indices = sorted(pending)
+            checked = await asyncio.get_running_loop().run_in_executor(
+                None, self._check_slow_files, [paths[i] for i in indices],
+                [pending[i] for i in indices]
+            )
+            for index, result in zip(indices, checked):
+                results[index] = result
+        
+        self._store_index({
+            self._index_key(paths[i]): (stamp, results[i]) for i, stamp in stamps.items()
+            if results[i]['encoding'] is not None  # Lesefehler nicht merken
+        })
         
         return results
+    
+    @staticmethod
+    def _index_key(path: str) -> str:
+        """Index-Schlüssel: absoluter, normalisierter Pfad (gleiche Datei, gleicher Eintrag)"""
+        return os.path.normcase(os.path.abspath(path))
+    
+    def _index_file(self) -> str:
+        """Pfad der Index-Datenbank"""
+        if self.index_path is None:
+            app_data = os.environ.get('APPDATA', os.path.expanduser('~'))
+            index_dir = Path(app_data) / 'DevCenter'
+            index_dir.mkdir(parents=True, exist_ok=True)
+            self.index_path = str(index_dir / 'encoding_index.db')
+        return self.index_path
+    
+    def _connect_index(self) -> sqlite3.Connection:
+        """Öffnet die Index-Datenbank (WAL) und legt die Tabelle an"""
+        conn = sqlite3.connect(self._index_file())
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS encoding_index (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                result TEXT NOT NULL
+            )
+        ''')
+        return conn
+    
+    def _load_index(self) -> Dict[str, Tuple[Tuple[int, int], str]]:
+        """Lädt den Index einmalig in den Speicher (leer wenn nicht lesbar)"""
+        if self._index is None:
+            self._index = {}
+            try:
+                with closing(self._connect_index()) as conn:
+                    for path, mtime_ns, size, result in conn.execute(
+                            'SELECT path, mtime_ns, size, result FROM encoding_index'):
+                        self._index[path] = ((mtime_ns, size), result)
+            except (OSError, sqlite3.Error):
+                pass
+        return self._index
+    
+    def _store_index(self, entries: Dict[str, Tuple[Tuple[int, int], dict]]):
+        """Schreibt neue Prüfergebnisse in einer Transaktion in den Index"""
+        if not entries:
+            return
+        rows = []
+        for path, (stamp, result) in entries.items():
+            serialized = json.dumps(result)
+            self._index[path] = (stamp, serialized)
+            rows.append((path, stamp[0], stamp[1], serialized))
+        try:
+            with closing(self._connect_index()) as conn, conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO encoding_index VALUES (?, ?, ?, ?)', rows
+                )
+        except (OSError, sqlite3.Error):
+            pass  # Index ist nur ein Cache
+    
+    def _check_slow_files(self, paths: List[str], contents: List[bytes]) -> List[dict]:
+        """Prüft Nicht-UTF-8-Dateien; ab PARALLEL_MIN_FILES im Prozess-Pool"""
+        if len(paths) < self.PARALLEL_MIN_FILES:
+            return [self._check_bytes(path, raw) for path, raw in zip(paths, contents)]
+        
+        # Bereits gelesene Inhalte mitgeben: kein zweites Lesen, und das Ergebnis
+        # passt zu dem Stand, der im Index vermerkt wird
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(
+                _check_bytes_worker, paths, contents, itertools.repeat(self.max_detect_bytes),
+                chunksize=16
+            ))
+    
+    @staticmethod
+    def _collect_files(dir_path: str, extensions: List[str] = None) -> List[str]:
+        """Sammelt die zu prüfenden Dateien eines Verzeichnisses"""
+        if extensions is None:
+            extensions = ['.py', '.txt', '.md', '.json', '.xml', '.html']
+        
+        suffixes = frozenset(ext.lstrip('.').lower() for ext in extensions)
+        return list(_iter_files(dir_path, suffixes))
+
+
+def _iter_files(root: str, suffixes: frozenset):
+    """Durchläuft root rekursiv mit os.scandir (Typ-Info aus readdir, keine Path-Objekte)"""
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path, suffixes)
+            else:
+                # Endung wie Path.suffix ('.bashrc' hat keine)
+                stem, _, suffix = entry.name.lstrip('.').rpartition('.')
+                if stem and suffix.lower() in suffixes and entry.is_file():
+                    yield entry.path
+        except OSError:
+            continue
+
+
+def _check_bytes_worker(file_path: str, raw: bytes, max_detect_bytes: int) -> dict:
+    """Prüft gelesenen Dateiinhalt in einem Pool-Prozess (muss auf Modulebene liegen)"""
+    return EncodingFixer(max_detect_bytes)._check_bytes(file_path, raw)
 
 
 if __name__ == "__main__":
@@ -6,14 +6,25 @@ Basierend auf MethodenAnalyser V3
 """
 
 import ast
+import hashlib
+import importlib.util
 import os
+import pickle
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
+from functools import lru_cache
 
+# numpy (optional) für die Zeilenstatistik großer Dateien; einmal je Prozess prüfen,
+# nicht je Analyzer (Pool-Worker erzeugen viele)
+_NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
 
-@dataclass
+
+@dataclass(slots=True)
 class MethodInfo:
     """Informationen über eine Methode/Funktion"""
     name: str
@@ -27,7 +38,7 @@ class MethodInfo:
     complexity: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassInfo:
     """Informationen über eine Klasse"""
     name: str
@@ -39,7 +50,7 @@ class ClassInfo:
     methods: List[MethodInfo] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportInfo:
     """Informationen über einen Import"""
     module: str
@@ -49,7 +60,7 @@ class ImportInfo:
     alias: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Ergebnis der Code-Analyse"""
     file_path: str
@@ -69,61 +80,212 @@ class AnalysisResult:
     undefined_names: Set[str] = field(default_factory=set)
 
 
-class ComplexityVisitor(ast.NodeVisitor):
-    """Berechnet die zyklomatische Komplexität"""
+# Bei Änderungen an Analyse oder Ergebnis-Klassen erhöhen (verwirft den Platten-Cache)
+_CACHE_VERSION = 2
+
+
+# Kommentar ab dem ersten '#' einer Zeile, sofern TODO oder FIXME darin vorkommt.
+# Läuft über den groß geschriebenen Quelltext (ohne IGNORECASE, deutlich schneller);
+# das '#' am Anfang lässt re per Literal-Suche vorspringen.
+_TODO_RE = re.compile(rb'#(?=[^\n]*?(?:TODO|FIXME))([^\n]*)')
+
+
+# Felder, die nie Kindknoten mit eigener Logik enthalten (Strings, Zahlen,
+# Kontext- und Operator-Singletons); generic_visit überspringt sie
+_LEAF_FIELDS = frozenset({
+    'ctx', 'op', 'ops', 'id', 'arg', 'attr', 'name', 'asname', 'module',
+    'level', 'kind', 'type_comment', 'conversion', 'is_async', 'simple', 'tag'
+})
+# Weitere Felder ohne Kindknoten, deren Name anderswo Knoten enthält
+_LEAF_FIELDS_BY_TYPE = {
+    'Constant': {'value'},
+    'MatchSingleton': {'value'},
+    'Global': {'names'},
+    'Nonlocal': {'names'},
+    'MatchMapping': {'rest'},
+    'MatchClass': {'kwd_attrs'},
+}
+# Ausnahmen: hier ist 'name' ein Ausdruck (ab Python 3.12)
+_NODE_NAME_TYPES = frozenset({'TypeAlias'})
+
+# Knotentypen für exakte type()-Vergleiche (statt isinstance mit MRO-Prüfung)
+_FUNCTION_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef})
+_MUTABLE_DEFAULT_TYPES = frozenset({ast.List, ast.Dict, ast.Set})
+
+
+def _node_types(base: type = ast.AST) -> Dict[str, type]:
+    """Alle AST-Knotenklassen nach Namen"""
+    types = {}
+    for sub in base.__subclasses__():
+        types[sub.__name__] = sub
+        types.update(_node_types(sub))
+    return types
+
+
+@lru_cache(maxsize=None)
+def _child_fields(node_type: type) -> Tuple[str, ...]:
+    """Felder einer Knotenklasse, die Kindknoten enthalten (einmal je Klasse)
     
-    def __init__(self):
-        self.complexity = 1
+    Die Felder enthalten danach nur noch Knoten, None oder Listen davon.
+    """
+    type_name = node_type.__name__
+    skip = _LEAF_FIELDS_BY_TYPE.get(type_name, set())
+    return tuple(
+        f for f in node_type._fields
+        if f not in skip and (f not in _LEAF_FIELDS
+                              or (f == 'name' and type_name in _NODE_NAME_TYPES))
+    )
+
+
+class _ReversedChildFields(dict):
+    """Knotenklasse -> _child_fields rückwärts (Kinder kommen umgekehrt auf den Stack)"""
     
-    def visit_If(self, node):
-        """Zaehlt if-Verzweigung als Komplexitaetspunkt."""
-        self.complexity += 1
-        self.generic_visit(node)
+    def __missing__(self, node_type: type) -> Tuple[str, ...]:
+        fields = self[node_type] = _child_fields(node_type)[::-1]
+        return fields
 
-    def visit_For(self, node):
-        """Zaehlt for-Schleife als Komplexitaetspunkt."""
-        self.complexity += 1
-        self.generic_visit(node)
 
-    def visit_While(self, node):
-        """Zaehlt while-Schleife als Komplexitaetspunkt."""
-        self.complexity += 1
-        self.generic_visit(node)
+_REVERSED_CHILD_FIELDS = _ReversedChildFields()
 
-    def visit_ExceptHandler(self, node):
-        """Zaehlt except-Block als Komplexitaetspunkt."""
-        self.complexity += 1
-        self.generic_visit(node)
 
-    def visit_With(self, node):
-        """Zaehlt with-Block als Komplexitaetspunkt."""
-        self.complexity += 1
-        self.generic_visit(node)
+class _Deferred:
+    """Stack-Eintrag, der func(*args) aufruft, wenn er an der Reihe ist"""
+    
+    __slots__ = ('func', 'args')
+    
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+    
+    def run(self):
+        self.func(*self.args)
 
-    def visit_BoolOp(self, node):
-        """Zaehlt boolesche Operatoren als Komplexitaetspunkte."""
-        self.complexity += len(node.values) - 1
-        self.generic_visit(node)
 
-    def visit_comprehension(self, node):
-        """Zaehlt Comprehension als Komplexitaetspunkt."""
-        self.complexity += 1
-        self.generic_visit(node)
+@lru_cache(maxsize=None)
+def _handler_names(visitor_type: type) -> Tuple[Tuple[type, str], ...]:
+    """(Knotenklasse, Methodenname) aller visit_*-Methoden einer Visitor-Klasse"""
+    return tuple(
+        (node_type, 'visit_' + name) for name, node_type in _node_types().items()
+        if hasattr(visitor_type, 'visit_' + name)
+    )
+
+
+class FastNodeVisitor(ast.NodeVisitor):
+    """
+    NodeVisitor mit Dispatch-Tabelle und Arbeitsliste
+    
+    visit() sucht den Handler über type(node) in einem Dict statt per
+    getattr('visit_' + Klassenname) je Knoten. Statt Rekursion legt
+    generic_visit() die Kindknoten auf einen Stack, den visit() in einer
+    Schleife abarbeitet (Quelltext-Reihenfolge, keine Rekursionsgrenze).
+    Handler laufen daher vor den Kindknoten; Code für danach wird mit
+    defer() vor generic_visit() eingereiht.
+    """
+    
+    def __init__(self):
+        self._dispatch = {
+            node_type: getattr(self, name) for node_type, name in _handler_names(type(self))
+        }
+        self._dispatch[_Deferred] = _Deferred.run
+        self._stack: List[Any] = []
+    
+    def visit(self, node):
+        """Besucht node und alle Nachfahren."""
+        dispatch = self._dispatch
+        child_fields = _REVERSED_CHILD_FIELDS
+        outer = self._stack
+        stack = self._stack = [node]
+        push = stack.append
+        try:
+            while stack:
+                node = stack.pop()
+                node_type = type(node)
+                handler = dispatch.get(node_type)
+                if handler is not None:
+                    handler(node)
+                    continue
+                # generic_visit eingebettet (häufigster Fall, spart einen Aufruf je Knoten)
+                for name in child_fields[node_type]:
+                    value = getattr(node, name, None)
+                    if value is None:
+                        continue
+                    if type(value) is list:
+                        for item in reversed(value):
+                            if item is not None:
+                                push(item)
+                    else:
+                        push(value)
+        finally:
+            self._stack = outer
+    
+    def generic_visit(self, node):
+        """Legt die Kindknoten zum Besuch auf den Stack."""
+        push = self._stack.append
+        for name in _REVERSED_CHILD_FIELDS[type(node)]:
+            value = getattr(node, name, None)
+            if value is None:
+                continue
+            if type(value) is list:
+                for item in reversed(value):
+                    if item is not None:  # z.B. kw_defaults, Dict.keys bei **
+                        push(item)
+            else:
+                push(value)
+    
+    def defer(self, func, *args):
+        """Ruft func(*args) auf, sobald die danach eingereihten Kindknoten besucht sind."""
+        self._stack.append(_Deferred(func, args))
+
 
+# Knotentypen, die je Vorkommen einen Komplexitätspunkt zählen (BoolOp separat)
+_COMPLEXITY_TYPES = frozenset({
+    ast.If, ast.For, ast.While, ast.ExceptHandler, ast.With, ast.comprehension
+})
 
-class NameCollector(ast.NodeVisitor):
+
+def compute_complexity(node: ast.AST) -> int:
+    """Berechnet die zyklomatische Komplexität eines Teilbaums
+    
+    Ein Durchlauf über eine Arbeitsliste mit einer Typprüfung je Knoten;
+    schneller als ast.walk, da Blattfelder (_child_fields) übersprungen werden.
+    """
+    complexity = 1
+    stack = [node]
+    push = stack.append
+    extend = stack.extend
+    while stack:
+        node = stack.pop()
+        if node is None:  # z.B. kw_defaults, Dict.keys bei **
+            continue
+        node_type = type(node)
+        if node_type in _COMPLEXITY_TYPES:
+            complexity += 1
+        elif node_type is ast.BoolOp:
+            complexity += len(node.values) - 1
+        for name in _child_fields(node_type):
+            value = getattr(node, name, None)
+            if type(value) is list:
+                extend(value)
+            elif value is not None:
+                push(value)
+    return complexity
+
+
+class NameCollector(FastNodeVisitor):
     """Sammelt alle verwendeten Namen im Code"""
     
     def __init__(self):
+        super().__init__()
         self.used_names: Set[str] = set()
         self.defined_names: Set[str] = set()
         self.imported_names: Set[str] = set()
     
     def visit_Name(self, node):
         """Sammelt verwendete und definierte Variablennamen."""
-        if isinstance(node.ctx, ast.Load):
+        ctx = type(node.ctx)
+        if ctx is ast.Load:
             self.used_names.add(node.id)
-        elif isinstance(node.ctx, ast.Store):
+        elif ctx is ast.Store:
             self.defined_names.add(node.id)
         self.generic_visit(node)
 
@@ -158,6 +320,153 @@ class NameCollector(ast.NodeVisitor):
         self.generic_visit(node)
 
 
+class UnifiedAnalyzerVisitor(FastNodeVisitor):
+    """
+    Sammelt Imports, Klassen, Funktionen, Namen, Komplexität und Warnungen
+    in einem einzigen Durchlauf über den AST
+    """
+    
+    def __init__(self, analyzer: 'MethodAnalyzer', result: AnalysisResult):
+        super().__init__()
+        self.analyzer = analyzer
+        self.result = result
+        self.used_names: Set[str] = set()
+        self.defined_names: Set[str] = set()
+        self.imported_names: Set[str] = set()
+        # Komplexität je offener Funktion; unterster Eintrag = Modulebene (ignoriert)
+        self._complexity: List[int] = [1]
+        # Funktionsknoten -> Liste, in die ihr MethodInfo gehört (Top-Level bzw. Klasse)
+        self._owners: Dict[ast.AST, List[MethodInfo]] = {}
+    
+    def visit_Module(self, node):
+        """Merkt Top-Level-Funktionen vor."""
+        self._add_owned(node.body, self.result.functions)
+        self.generic_visit(node)
+    
+    def visit_Import(self, node):
+        """Erfasst import-Anweisungen und die importierten Namen."""
+        for alias in node.names:
+            self.result.imports.append(ImportInfo(
+                module=alias.name,
+                names=[],
+                line=node.lineno,
+                is_from_import=False,
+                alias=alias.asname
+            ))
+            self.imported_names.add(alias.asname if alias.asname else alias.name.split('.')[0])
+    
+    def visit_ImportFrom(self, node):
+        """Erfasst from-import-Anweisungen und die importierten Namen."""
+        self.result.imports.append(ImportInfo(
+            module=node.module or '',
+            names=[alias.name for alias in node.names],
+            line=node.lineno,
+            is_from_import=True
+        ))
+        for alias in node.names:
+            self.imported_names.add(alias.asname if alias.asname else alias.name)
+    
+    def visit_ClassDef(self, node):
+        """Erfasst die Klasse; direkte Methoden landen in ihrer Methodenliste."""
+        analyzer = self.analyzer
+        class_info = ClassInfo(
+            name=node.name,
+            line=node.lineno,
+            end_line=node.end_lineno,
+            bases=[sys.intern(analyzer._get_name(base)) for base in node.bases],
+            docstring=ast.get_docstring(node),
+            decorators=[sys.intern(analyzer._get_decorator_name(d)) for d in node.decorator_list]
+        )
+        self.result.classes.append(class_info)
+        self._add_owned(node.body, class_info.methods)
+        
+        self.defined_names.add(node.name)
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        """Erfasst Funktion, Argumente, Mutable Defaults und Komplexität."""
+        self.defined_names.add(node.name)
+        for arg in node.args.args:
+            self.defined_names.add(arg.arg)
+        
+        # Mutable Default Arguments
+        for default in node.args.defaults + node.args.kw_defaults:
+            if type(default) in _MUTABLE_DEFAULT_TYPES:
+                self.result.warnings.append({
+                    'type': 'MutableDefault',
+                    'message': f'Mutable Default-Argument in {node.name}()',
+                    'line': node.lineno
+                })
+        
+        info = None
+        owner = self._owners.pop(node, None)
+        if owner is not None:
+            info = self.analyzer._analyze_function(node)
+            owner.append(info)
+        
+        self._complexity.append(1)
+        self.defer(self._leave_function, node, info)
+        self.generic_visit(node)
+    
+    def _leave_function(self, node, info: Optional[MethodInfo]):
+        """Schließt die Funktion ab, nachdem ihr Rumpf besucht wurde."""
+        complexity = self._complexity.pop()
+        # Verschachtelte Funktionen zählen (wie bisher) auch für die äußere
+        self._complexity[-1] += complexity - 1
+        
+        if info is not None:
+            info.complexity = complexity
+        
+        # Zu komplexe Funktionen
+        if complexity > 10:
+            self.result.warnings.append({
+                'type': 'HighComplexity',
+                'message': f'Hohe Komplexität ({complexity}) in {node.name}()',
+                'line': node.lineno
+            })
+    
+    def visit_AsyncFunctionDef(self, node):
+        """Delegiert an visit_FunctionDef fuer async-Funktionen."""
+        self.visit_FunctionDef(node)
+    
+    def visit_Name(self, node):
+        """Sammelt verwendete und definierte Variablennamen."""
+        ctx = type(node.ctx)
+        if ctx is ast.Load:
+            self.used_names.add(node.id)
+        elif ctx is ast.Store:
+            self.defined_names.add(node.id)
+    
+    def visit_ExceptHandler(self, node):
+        """Zaehlt except-Block als Komplexitaetspunkt; warnt bei bare except."""
+        if node.type is None:
+            self.result.warnings.append({
+                'type': 'BareExcept',
+                'message': 'Bare except: gefunden - sollte spezifische Exception angeben',
+                'line': node.lineno
+            })
+        self._complexity[-1] += 1
+        self.generic_visit(node)
+    
+    def _count(self, node):
+        """Zaehlt einen Komplexitaetspunkt (if, for, while, with, comprehension)."""
+        self._complexity[-1] += 1
+        self.generic_visit(node)
+    
+    visit_If = visit_For = visit_While = visit_With = visit_comprehension = _count
+    
+    def visit_BoolOp(self, node):
+        """Zaehlt boolesche Operatoren als Komplexitaetspunkte."""
+        self._complexity[-1] += len(node.values) - 1
+        self.generic_visit(node)
+    
+    def _add_owned(self, body: List[ast.stmt], owner: List[MethodInfo]):
+        """Ordnet direkte Funktionen eines Blocks der Liste owner zu"""
+        for item in body:
+            if type(item) in _FUNCTION_TYPES:
+                self._owners[item] = owner
+
+
 class MethodAnalyzer:
     """
     Hauptklasse für statische Code-Analyse
@@ -170,7 +479,7 @@ class MethodAnalyzer:
     """
     
     # Standard-Builtins die immer verfügbar sind
-    BUILTINS = {
+    BUILTINS = frozenset({
         'abs', 'all', 'any', 'ascii', 'bin', 'bool', 'breakpoint', 'bytearray',
         'bytes', 'callable', 'chr', 'classmethod', 'compile', 'complex',
         'delattr', 'dict', 'dir', 'divmod', 'enumerate', 'eval', 'exec',
@@ -187,15 +496,34 @@ class MethodAnalyzer:
         'FileNotFoundError', 'RuntimeError', 'StopIteration', 'GeneratorExit',
         'AssertionError', 'NameError', 'ZeroDivisionError', 'OverflowError',
         'MemoryError', 'RecursionError', 'SystemExit', 'KeyboardInterrupt'
-    }
+    })
     
-    def __init__(self):
+    # Ab dieser Dateianzahl lohnt sich in analyze_directory ein Prozess-Pool
+    PARALLEL_MIN_FILES = 16
+    
+    # Ab dieser Dateigröße zählt _scan_lines die Zeilen mit numpy (falls installiert)
+    NUMPY_MIN_BYTES = 50 * 1024
+    
+    def __init__(self, cache_dir: str = None, disk_cache: bool = True):
+        """
+        Args:
+            cache_dir: Verzeichnis für gespeicherte Ergebnisse
+                (Standard: DevCenter-Verzeichnis in APPDATA bzw. Home)
+            disk_cache: Ergebnisse auch über Programmläufe hinweg speichern
+        """
         self.current_file: Optional[str] = None
+        self.cache_dir = cache_dir
+        self.disk_cache = disk_cache
+        # Pfad -> ((st_mtime_ns, st_size), Ergebnis)
+        self._mem_cache: Dict[str, Tuple[Tuple[int, int], AnalysisResult]] = {}
     
     def analyze_file(self, file_path: str) -> AnalysisResult:
         """
         Analysiert eine Python-Datei
         
+        Unveränderte Dateien (gleiche mtime und Größe) werden nicht erneut
+        geparst; das zwischengespeicherte Ergebnis wird zurückgegeben.
+        
         Args:
             file_path: Pfad zur Python-Datei
             
@@ -203,10 +531,74 @@ class MethodAnalyzer:
             AnalysisResult mit allen Analysedaten
         """
         self.current_file = file_path
+        
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return self._analyze_source(file_path)  # meldet den Lesefehler
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._mem_cache.get(file_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        result = self._load_cached(file_path, key)
+        if result is None:
+            result = self._analyze_source(file_path)
+            self._store_cached(file_path, key, result)
+        
+        self._mem_cache[file_path] = (key, result)
+        return result
+    
+    def clear_cache(self):
+        """Verwirft die im Speicher gehaltenen Ergebnisse"""
+        self._mem_cache.clear()
+    
+    def _cache_file(self, file_path: str) -> Path:
+        """Datei des Platten-Caches für eine Quelldatei"""
+        if self.cache_dir is None:
+            app_data = os.environ.get('APPDATA', os.path.expanduser('~'))
+            self.cache_dir = str(Path(app_data) / 'DevCenter' / 'analyzer_cache')
+        digest = hashlib.blake2b(os.path.abspath(file_path).encode('utf-8'), digest_size=16)
+        return Path(self.cache_dir) / f"{digest.hexdigest()}.pkl"
+    
+    def _load_cached(self, file_path: str, key: Tuple[int, int]) -> Optional[AnalysisResult]:
+        """Lädt ein gespeichertes Ergebnis, wenn es zu key passt"""
+        if not self.disk_cache:
+            return None
+        try:
+            with open(self._cache_file(file_path), 'rb') as f:
+                version, cached_key, result = pickle.load(f)
+        except Exception:
+            return None  # fehlt, veraltet oder beschädigt
+        if version != _CACHE_VERSION or cached_key != key:
+            return None
+        return result
+    
+    def _store_cached(self, file_path: str, key: Tuple[int, int], result: AnalysisResult):
+        """Speichert ein Ergebnis im Platten-Cache (Fehler werden ignoriert)"""
+        if not self.disk_cache:
+            return
+        cache_file = self._cache_file(file_path)
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((_CACHE_VERSION, key, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)  # Pool-Prozesse schreiben nie halbe Dateien
+        except OSError:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+    
+    def _analyze_source(self, file_path: str) -> AnalysisResult:
+        """Liest, parst und analysiert eine Datei (ohne Cache)"""
         result = AnalysisResult(file_path=file_path)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Bytes: ast.parse dekodiert selbst (inkl. Encoding-Deklaration)
+            with open(file_path, 'rb') as f:
                 source = f.read()
         except Exception as e:
             result.errors.append({
@@ -216,22 +608,12 @@ class MethodAnalyzer:
             })
             return result
         
-        # Zeilen-Statistiken
-        lines = source.split('\n')
-        result.total_lines = len(lines)
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                result.blank_lines += 1
-            elif stripped.startswith('#'):
-                result.comment_lines += 1
-            else:
-                result.code_lines += 1
+        # Zeilen-Statistiken und TODO/FIXME in einem Durchlauf
+        comment_warnings = self._scan_lines(source, result)
         
         # AST parsen
         try:
-            tree = ast.parse(source)
+            tree = ast.parse(source, filename=file_path)
         except SyntaxError as e:
             result.errors.append({
                 'type': 'SyntaxError',
@@ -241,101 +623,46 @@ class MethodAnalyzer:
             })
             return result
         
-        # Analyse durchführen
-        self._analyze_imports(tree, result)
-        self._analyze_classes(tree, result)
-        self._analyze_functions(tree, result)
-        self._analyze_names(tree, result)
-        self._check_common_issues(tree, result, source)
+        # Analyse in einem Durchlauf
+        visitor = UnifiedAnalyzerVisitor(self, result)
+        visitor.visit(tree)
+        self._analyze_names(visitor, result)
+        result.warnings.extend(comment_warnings)
         
         return result
     
-    def _analyze_imports(self, tree: ast.AST, result: AnalysisResult):
-        """Analysiert Imports"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    result.imports.append(ImportInfo(
-                        module=alias.name,
-                        names=[],
-                        line=node.lineno,
-                        is_from_import=False,
-                        alias=alias.asname
-                    ))
-            
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ''
-                names = [alias.name for alias in node.names]
-                result.imports.append(ImportInfo(
-                    module=module,
-                    names=names,
-                    line=node.lineno,
-                    is_from_import=True
-                ))
-    
-    def _analyze_classes(self, tree: ast.AST, result: AnalysisResult):
-        """Analysiert Klassen"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_info = ClassInfo(
-                    name=node.name,
-                    line=node.lineno,
-                    end_line=node.end_lineno or node.lineno,
-                    bases=[self._get_name(base) for base in node.bases],
-                    docstring=ast.get_docstring(node),
-                    decorators=[self._get_decorator_name(d) for d in node.decorator_list]
-                )
-                
-                # Methoden der Klasse
-                for item in node.body:
-                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        method_info = self._analyze_function(item)
-                        class_info.methods.append(method_info)
-                
-                result.classes.append(class_info)
-    
-    def _analyze_functions(self, tree: ast.AST, result: AnalysisResult):
-        """Analysiert Top-Level Funktionen"""
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                result.functions.append(self._analyze_function(node))
-    
     def _analyze_function(self, node) -> MethodInfo:
         """Analysiert eine einzelne Funktion"""
-        # Argumente
+        # Zusammengesetzte Texte wie "self", "x: int" oder "Optional[str]"
+        # wiederholen sich oft; sys.intern teilt sie über alle (zwischen-
+        # gespeicherten) Ergebnisse. Bezeichner wie arg.arg und node.name
+        # interniert bereits der Parser.
         args = []
         for arg in node.args.args:
             arg_str = arg.arg
             if arg.annotation:
-                arg_str += f": {self._get_annotation(arg.annotation)}"
+                arg_str = sys.intern(f"{arg_str}: {self._get_annotation(arg.annotation)}")
             args.append(arg_str)
         
         # Rückgabetyp
         returns = None
         if node.returns:
-            returns = self._get_annotation(node.returns)
-        
-        # Komplexität
-        complexity_visitor = ComplexityVisitor()
-        complexity_visitor.visit(node)
+            returns = sys.intern(self._get_annotation(node.returns))
         
+        # Komplexität setzt UnifiedAnalyzerVisitor nach dem Funktionsrumpf
         return MethodInfo(
             name=node.name,
             line=node.lineno,
-            end_line=node.end_lineno or node.lineno,
+            end_line=node.end_lineno,
             args=args,
             returns=returns,
             docstring=ast.get_docstring(node),
-            decorators=[self._get_decorator_name(d) for d in node.decorator_list],
-            is_async=isinstance(node, ast.AsyncFunctionDef),
-            complexity=complexity_visitor.complexity
+            decorators=[sys.intern(self._get_decorator_name(d)) for d in node.decorator_list],
+            is_async=isinstance(node, ast.AsyncFunctionDef)
         )
     
-    def _analyze_names(self, tree: ast.AST, result: AnalysisResult):
+    def _analyze_names(self, collector: UnifiedAnalyzerVisitor, result: AnalysisResult):
         """Analysiert Namensverwendung für ungenutzte Imports"""
-        collector = NameCollector()
-        collector.visit(tree)
-        
         # Ungenutzte Imports finden
         for imp in result.imports:
             if imp.is_from_import:
@@ -347,65 +674,72 @@ class MethodAnalyzer:
                 if name not in collector.used_names:
                     result.unused_imports.add(imp.module)
         
-        # Undefinierte Namen (mit Vorsicht - kann False Positives haben)
-        all_defined = collector.defined_names | collector.imported_names | self.BUILTINS
-        for name in collector.used_names:
-            if name not in all_defined:
-                result.undefined_names.add(name)
-    
-    def _check_common_issues(self, tree: ast.AST, result: AnalysisResult, source: str):
-        """Prüft auf häufige Code-Probleme"""
-        
-        for node in ast.walk(tree):
-            # Bare except
-            if isinstance(node, ast.ExceptHandler):
-                if node.type is None:
-                    result.warnings.append({
-                        'type': 'BareExcept',
-                        'message': 'Bare except: gefunden - sollte spezifische Exception angeben',
-                        'line': node.lineno
-                    })
-            
-            # Mutable Default Arguments
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                for default in node.args.defaults + node.args.kw_defaults:
-                    if default and isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                        result.warnings.append({
-                            'type': 'MutableDefault',
-                            'message': f'Mutable Default-Argument in {node.name}()',
-                            'line': node.lineno
-                        })
-            
-            # Zu komplexe Funktionen
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                cv = ComplexityVisitor()
-                cv.visit(node)
-                if cv.complexity > 10:
-                    result.warnings.append({
-                        'type': 'HighComplexity',
-                        'message': f'Hohe Komplexität ({cv.complexity}) in {node.name}()',
-                        'line': node.lineno
-                    })
-            
-            # TODO-Kommentare finden
-            pass  # Wird über Source-Lines gemacht
-        
-        # TODO/FIXME in Kommentaren
-        for i, line in enumerate(source.split('\n'), 1):
-            if '#' in line:
-                comment = line.split('#', 1)[1]
-                if 'TODO' in comment.upper():
-                    result.warnings.append({
-                        'type': 'TODO',
-                        'message': f'TODO gefunden: {comment.strip()[:50]}...',
-                        'line': i
-                    })
-                elif 'FIXME' in comment.upper():
-                    result.warnings.append({
-                        'type': 'FIXME',
-                        'message': f'FIXME gefunden: {comment.strip()[:50]}...',
-                        'line': i
-                    })
+        # Undefinierte Namen (mit Vorsicht - kann False Positives haben);
+        # Differenz in C, ohne die Vereinigung aller Definitionen anzulegen
+        result.undefined_names = collector.used_names.difference(
+            collector.defined_names, collector.imported_names, self.BUILTINS
+        )
+    
+    def _scan_lines(self, source: bytes, result: AnalysisResult) -> List[Dict[str, Any]]:
+        """Zählt Code-, Kommentar- und Leerzeilen; gibt TODO/FIXME-Warnungen zurück"""
+        if _NUMPY_AVAILABLE and len(source) >= self.NUMPY_MIN_BYTES:
+            total, blank, comment_lines = self._count_lines_numpy(source)
+        else:
+            lines = source.split(b'\n')
+            total = len(lines)
+            blank = comment_lines = 0
+            for line in lines:
+                stripped = line.strip()
+                if not stripped:
+                    blank += 1
+                elif stripped.startswith(b'#'):
+                    comment_lines += 1
+        
+        result.total_lines = total
+        result.blank_lines = blank
+        result.comment_lines = comment_lines
+        result.code_lines = total - blank - comment_lines
+        
+        # TODO/FIXME in Kommentaren: eine Regex-Suche statt Prüfungen je Zeile
+        warnings = []
+        upper = source.upper()  # gleiche Länge, Positionen bleiben gültig
+        if b'TODO' not in upper and b'FIXME' not in upper:
+            return warnings
+        
+        line, pos = 1, 0
+        for match in _TODO_RE.finditer(upper):
+            # Zeilennummer über fortlaufend gezählte Umbrüche
+            line += source.count(b'\n', pos, match.start())
+            pos = match.start()
+            kind = 'TODO' if b'TODO' in match.group(1) else 'FIXME'
+            text = source[match.start(1):match.end(1)].decode('utf-8', errors='replace').strip()
+            warnings.append({
+                'type': kind,
+                'message': f'{kind} gefunden: {text[:50]}...',
+                'line': line
+            })
+        
+        return warnings
+    
+    def _count_lines_numpy(self, source: bytes) -> Tuple[int, int, int]:
+        """Zählt (Zeilen, Leerzeilen, Kommentarzeilen) vektorisiert wie _scan_lines"""
+        import numpy as np
+        arr = np.frombuffer(source, dtype=np.uint8)
+        newlines = np.flatnonzero(arr == 0x0A)
+        # Zeilen wie bei split(b'\n'): Beginn nach jedem Umbruch, Ende am nächsten
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.append(newlines, arr.size)
+        
+        # Erstes Zeichen je Zeile, das bytes.strip() nicht entfernen würde
+        # (Leerzeichen und 0x09-0x0D); arr.size als Wächter für leere Zeilen
+        is_content = (arr > 0x20) | (arr < 0x09) | ((arr > 0x0D) & (arr < 0x20))
+        content = np.append(np.flatnonzero(is_content), arr.size)
+        first = content[np.searchsorted(content, starts)]
+        
+        has_content = first < ends
+        comments = arr[first[has_content]] == 0x23  # '#'
+        total = len(starts)
+        return total, total - int(has_content.sum()), int(comments.sum())
     
     def _get_name(self, node) -> str:
         """Extrahiert einen Namen aus einem AST-Knoten"""
@@ -458,19 +792,59 @@ class MethodAnalyzer:
         Returns:
             Dict mit Dateipfad -> AnalysisResult
         """
-        results = {}
-        path = Path(dir_path)
+        return dict(self.iter_directory(dir_path, recursive))
+    
+    def iter_directory(self, dir_path: str,
+                       recursive: bool = True) -> Iterator[Tuple[str, AnalysisResult]]:
+        """
+        Wie analyze_directory, liefert die Ergebnisse aber einzeln
+        (Dateipfad, AnalysisResult), sobald sie vorliegen
         
-        pattern = "**/*.py" if recursive else "*.py"
+        Wird der Generator vorzeitig geschlossen, werden ausstehende
+        Aufträge im Prozess-Pool verworfen statt abgewartet.
+        """
+        files = list(_iter_python_files(dir_path, recursive))
         
-        for py_file in path.glob(pattern):
-            # __pycache__ überspringen
-            if '__pycache__' in str(py_file):
+        # Unveränderte Dateien kommen aus dem Speicher-Cache, nur der Rest zählt
+        stamps: Dict[str, Optional[Tuple[int, int]]] = {}  # Pfad -> (mtime_ns, size)
+        for file_path in files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stamps[file_path] = None  # Lesefehler meldet analyze_file
                 continue
-            
-            results[str(py_file)] = self.analyze_file(str(py_file))
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = self._mem_cache.get(file_path)
+            if cached is None or cached[0] != key:
+                stamps[file_path] = key
+        
+        if len(stamps) < self.PARALLEL_MIN_FILES:
+            for file_path in files:
+                yield file_path, self.analyze_file(file_path)
+            return
         
-        return results
+        # CPU-gebundenes Parsen auf alle Kerne verteilen (GIL umgehen);
+        # Worker auf Modulebene, damit nicht der ganze Cache gepickelt wird
+        workers = os.cpu_count() or 1
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(self.cache_dir, self.disk_cache)
+        )
+        try:
+            results = executor.map(
+                _analyze_file_worker, list(stamps),
+                chunksize=max(1, len(stamps) // (workers * 4))
+            )
+            for file_path in files:
+                if file_path not in stamps:
+                    yield file_path, self._mem_cache[file_path][1]
+                    continue
+                result = next(results)
+                if stamps[file_path] is not None:
+                    self._mem_cache[file_path] = (stamps[file_path], result)
+                yield file_path, result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def get_summary(self, result: AnalysisResult) -> str:
         """Erstellt eine lesbare Zusammenfassung"""
@@ -526,6 +900,42 @@ class MethodAnalyzer:
         return "\n".join(lines)
 
 
+def _iter_python_files(root: str, recursive: bool = True) -> Iterator[str]:
+    """Durchläuft root per os.scandir nach .py-Dateien (ohne __pycache__)"""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.name != '__pycache__':
+                        stack.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    yield entry.path
+            except OSError:
+                continue
+
+
+# Analyzer des Pool-Prozesses (von _init_worker angelegt)
+_worker_analyzer: Optional[MethodAnalyzer] = None
+
+
+def _init_worker(cache_dir: Optional[str], disk_cache: bool):
+    """Legt je Pool-Prozess einen Analyzer an (initializer des Prozess-Pools)"""
+    global _worker_analyzer
+    _worker_analyzer = MethodAnalyzer(cache_dir, disk_cache)
+
+
+def _analyze_file_worker(file_path: str) -> AnalysisResult:
+    """Analysiert eine Datei in einem Pool-Prozess (muss auf Modulebene liegen)"""
+    return _worker_analyzer.analyze_file(file_path)
+
+
 if __name__ == "__main__":
     # Test
     import sys
@@ -7,7 +7,7 @@ Basierend auf IcoBuilder
 
 import os
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Any
 
 
 class IcoBuilder:
@@ -19,11 +19,18 @@ class IcoBuilder:
     
     # Standard ICO-Größen
     DEFAULT_SIZES = [16, 24, 32, 48, 64, 128, 256]
+    # (Breite, Höhe) für save(), absteigend; einmalig für die Standardgrößen
+    _DEFAULT_SIZE_PAIRS = [(s, s) for s in sorted(DEFAULT_SIZES, reverse=True)]
     
     def __init__(self):
         self._pillow_available = False
+        # Font je Schriftgröße (truetype parst die TTF-Datei bei jedem Laden)
+        self._font_cache: Dict[int, Any] = {}
         try:
-            from PIL import Image
+            from PIL import Image, ImageDraw, ImageFont
+            self._Image = Image
+            self._ImageDraw = ImageDraw
+            self._ImageFont = ImageFont
             self._pillow_available = True
         except ImportError:
             pass
@@ -53,14 +60,13 @@ class IcoBuilder:
         if not os.path.exists(input_path):
             return False, f"Datei nicht gefunden: {input_path}"
         
-        if sizes is None:
-            sizes = self.DEFAULT_SIZES
+        size_pairs = self._size_pairs(sizes)
         
         if output_path is None:
             output_path = str(Path(input_path).with_suffix('.ico'))
         
         try:
-            from PIL import Image
+            Image = self._Image
             
             # Bild laden
             img = Image.open(input_path)
@@ -69,17 +75,16 @@ class IcoBuilder:
             if img.mode != 'RGBA':
                 img = img.convert('RGBA')
             
-            # Icons in verschiedenen Größen erstellen
-            icon_images = []
-            for size in sorted(sizes, reverse=True):
-                resized = img.resize((size, size), Image.Resampling.LANCZOS)
-                icon_images.append(resized)
+            # Nur die größte Stufe erzeugen; das ICO-Plugin skaliert daraus
+            # alle kleineren Größen (LANCZOS)
+            size = size_pairs[0][0]
+            base = img.resize((size, size), Image.Resampling.LANCZOS)
             
             # Als ICO speichern
-            icon_images[0].save(
+            base.save(
                 output_path,
                 format='ICO',
-                sizes=[(s, s) for s in sizes]
+                sizes=size_pairs
             )
             
             return True, output_path
@@ -109,44 +114,36 @@ class IcoBuilder:
         if not self._pillow_available:
             return False, "Pillow nicht installiert"
         
-        if sizes is None:
-            sizes = self.DEFAULT_SIZES
+        size_pairs = self._size_pairs(sizes)
         
         try:
-            from PIL import Image, ImageDraw, ImageFont
+            Image, ImageDraw = self._Image, self._ImageDraw
+            
+            # Text nur einmal in der größten Stufe rendern; das ICO-Plugin
+            # skaliert daraus alle kleineren Größen (LANCZOS)
+            size = size_pairs[0][0]
+            img = Image.new('RGBA', (size, size), bg_color)
+            draw = ImageDraw.Draw(img)
+            
+            # Font (größe proportional)
+            font = self._get_font(int(size * 0.6))
             
-            icon_images = []
-            
-            for size in sorted(sizes, reverse=True):
-                # Bild erstellen
-                img = Image.new('RGBA', (size, size), bg_color)
-                draw = ImageDraw.Draw(img)
-                
-                # Font (größe proportional)
-                font_size = int(size * 0.6)
-                try:
-                    font = ImageFont.truetype("arial.ttf", font_size)
-                except (OSError, IOError):
-                    font = ImageFont.load_default()
-                
-                # Text zentrieren
-                text_to_draw = text[:2]
-                bbox = draw.textbbox((0, 0), text_to_draw, font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                
-                x = (size - text_width) // 2
-                y = (size - text_height) // 2 - bbox[1]
-                
-                draw.text((x, y), text_to_draw, fill=text_color, font=font)
-                
-                icon_images.append(img)
+            # Text zentrieren
+            text_to_draw = text[:2]
+            bbox = draw.textbbox((0, 0), text_to_draw, font=font)
+            text_width = bbox[2] - bbox[0]
+            text_height = bbox[3] - bbox[1]
+            
+            x = (size - text_width) // 2
+            y = (size - text_height) // 2 - bbox[1]
+            
+            draw.text((x, y), text_to_draw, fill=text_color, font=font)
             
             # Als ICO speichern
-            icon_images[0].save(
+            img.save(
                 output_path,
                 format='ICO',
-                sizes=[(s, s) for s in sizes]
+                sizes=size_pairs
             )
             
             return True, output_path
@@ -154,6 +151,23 @@ class IcoBuilder:
         except Exception as e:
             return False, f"Fehler: {e}"
     
+    def _size_pairs(self, sizes: Optional[List[int]]) -> List[Tuple[int, int]]:
+        """Icon-Größen als (s, s)-Paare, ohne Duplikate und absteigend sortiert"""
+        if sizes is None:
+            return self._DEFAULT_SIZE_PAIRS
+        return [(s, s) for s in sorted(set(sizes), reverse=True)]
+    
+    def _get_font(self, font_size: int):
+        """Lädt den Font für eine Schriftgröße (einmalig je Größe)"""
+        font = self._font_cache.get(font_size)
+        if font is None:
+            try:
+                font = self._ImageFont.truetype("arial.ttf", font_size)
+            except (OSError, IOError):
+                font = self._ImageFont.load_default()
+            self._font_cache[font_size] = font
+        return font
+    
     def extract_from_exe(self, exe_path: str, output_path: str) -> Tuple[bool, str]:
         """
         Extrahiert ein Icon aus einer EXE-Datei
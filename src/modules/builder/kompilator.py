@@ -9,7 +9,11 @@ import os
 import sys
 import subprocess
 import shutil
+import site
+import sysconfig
 import json
+import locale
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Callable
 from dataclasses import dataclass, asdict
@@ -38,7 +42,8 @@ class BuildConfig:
     upx: bool = False
     upx_dir: Optional[str] = None
     strip: bool = False
-    clean: bool = True
+    # Nur für Release-Builds: verwirft die Caches von PyInstaller (Analyse, PYZ)
+    clean: bool = False
     
     # Metadaten
     version: Optional[str] = None
@@ -86,12 +91,21 @@ class Kompilator:
     ausführbare Dateien zu konvertieren.
     """
     
-    def __init__(self, pyinstaller_path: str = None):
+    # Blockgröße beim Lesen der PyInstaller-Ausgabe
+    READ_CHUNK_SIZE = 1 << 16
+    
+    def __init__(self, pyinstaller_path: str = None, cache_dir: str = None):
         """
         Args:
             pyinstaller_path: Optionaler Pfad zu PyInstaller
+            cache_dir: Basis für PYINSTALLER_CONFIG_DIR je Projekt
+                (Standard: DevCenter-Verzeichnis in APPDATA bzw. Home)
         """
         self.pyinstaller_path = pyinstaller_path
+        self.cache_dir = cache_dir
+        # Ergebnis von get_pyinstaller_version (einmal je Instanz ermittelt)
+        self._pyinstaller_version: Optional[str] = None
+        self._version_checked = False
         self._progress_callback: Optional[Callable] = None
         self._log: List[str] = []
     
@@ -112,18 +126,43 @@ class Kompilator:
         Returns:
             bool: True wenn PyInstaller gefunden wurde, sonst False.
         """
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'PyInstaller', '--version'],
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        return self.get_pyinstaller_version() is not None
     
     def get_pyinstaller_version(self) -> Optional[str]:
-        """Gibt die PyInstaller-Version zurück"""
+        """
+        Gibt die PyInstaller-Version zurück (None wenn nicht verfügbar)
+        
+        Der Aufruf von "python -m PyInstaller --version" kostet einen
+        Interpreter-Start; das Ergebnis wird daher je Instanz und auf der
+        Platte gespeichert, solange sich Interpreter und site-packages
+        nicht ändern.
+        """
+        if self._version_checked:
+            return self._pyinstaller_version
+        
+        key = self._environment_key()
+        cache_file = self._cache_base() / 'version.json'
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('key') != key:
+                raise ValueError("veraltet")
+            version = data['version']
+        except (OSError, ValueError, KeyError, TypeError):
+            version = self._query_pyinstaller_version()
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, 'w', encoding='utf-8') as f:
+                    json.dump({'key': key, 'version': version}, f)
+            except OSError:
+                pass  # nur Cache
+        
+        self._pyinstaller_version = version
+        self._version_checked = True
+        return version
+    
+    def _query_pyinstaller_version(self) -> Optional[str]:
+        """Fragt die PyInstaller-Version per Subprozess ab"""
         try:
             result = subprocess.run(
                 [sys.executable, '-m', 'PyInstaller', '--version'],
@@ -136,6 +175,18 @@ class Kompilator:
             pass
         return None
     
+    @staticmethod
+    def _environment_key() -> List[Any]:
+        """Interpreter und mtimes der Paketverzeichnisse (ändern sich bei pip install)"""
+        key: List[Any] = [sys.executable]
+        for path in (sys.executable, sysconfig.get_paths()['purelib'],
+                     site.getusersitepackages()):
+            try:
+                key.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return key
+    
     def build(self, config: BuildConfig) -> BuildResult:
         """
         Führt den Build-Prozess durch
@@ -184,20 +235,36 @@ class Kompilator:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                cwd=os.path.dirname(config.script_path) or '.'
+                bufsize=self.READ_CHUNK_SIZE,
+                cwd=os.path.dirname(config.script_path) or '.',
+                env=self._build_env(config)
             )
             
             progress = 20
             warnings = []
             
+            # Ausgabe blockweise lesen und je Block einmal dekodieren statt
+            # readline() je Zeile; unvollständige Zeilen bleiben im Puffer
+            encoding = locale.getpreferredencoding(False)
+            fd = process.stdout.fileno()
+            pending = bytearray()
             while True:
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
+                chunk = os.read(fd, self.READ_CHUNK_SIZE)
+                if chunk:
+                    pending += chunk
+                    end = pending.rfind(b'\n') + 1
+                    if not end:
+                        continue
+                    text = pending[:end].decode(encoding, errors='replace')
+                    del pending[:end]
+                else:
+                    # EOF: Rest ohne abschließenden Zeilenumbruch
+                    text = pending.decode(encoding, errors='replace')
                 
-                line = line.strip()
-                if line:
+                for line in text.splitlines():
+                    line = line.strip()
+                    if not line:
+                        continue
                     self._log.append(line)
                     
                     # Fortschritt schätzen
@@ -215,8 +282,12 @@ class Kompilator:
                         warnings.append(line)
                     
                     self._emit_progress(progress, line[:100])
+                
+                if not chunk:
+                    break
             
-            return_code = process.returncode
+            process.stdout.close()
+            return_code = process.wait()
             
         except Exception as e:
             return BuildResult(
@@ -262,6 +333,50 @@ class Kompilator:
                 warnings=warnings
             )
     
+    def build_many(self, configs: List[BuildConfig], max_workers: int = None,
+                   progress_callback: Callable[[int, int, str], None] = None) -> List[BuildResult]:
+        """
+        Führt mehrere Builds parallel durch
+        
+        PyInstaller läuft ohnehin als eigener Prozess, daher genügen Threads.
+        Jedes Projekt hat sein eigenes PYINSTALLER_CONFIG_DIR (siehe _build_env);
+        Builds mit gleichem Namen teilen sich aber build/ und dist/ und laufen
+        deshalb nacheinander.
+        
+        Args:
+            configs: Build-Konfigurationen
+            max_workers: Maximale Anzahl gleichzeitiger Builds (Standard: CPU-Kerne)
+            progress_callback: Erhält (job_id, progress, message); job_id ist
+                der Index in configs
+            
+        Returns:
+            BuildResult je Konfiguration, in gleicher Reihenfolge
+        """
+        results: List[Optional[BuildResult]] = [None] * len(configs)
+        
+        # Jobs nach Projektnamen gruppieren
+        groups: Dict[str, List[int]] = {}
+        for job_id, config in enumerate(configs):
+            groups.setdefault(config.name, []).append(job_id)
+        
+        def run_group(job_ids: List[int]):
+            # Eigene Instanz je Thread: _log und Callback sind Build-Zustand
+            kompilator = Kompilator(self.pyinstaller_path, self.cache_dir)
+            for job_id in job_ids:
+                if progress_callback:
+                    kompilator.set_progress_callback(
+                        lambda progress, message, job_id=job_id:
+                            progress_callback(job_id, progress, message)
+                    )
+                results[job_id] = kompilator.build(configs[job_id])
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(groups)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() reicht Ausnahmen aus den Threads weiter
+            list(pool.map(run_group, groups.values()))
+        
+        return results
+    
     def _build_command(self, config: BuildConfig) -> List[str]:
         """Erstellt das PyInstaller-Kommando"""
         cmd = [sys.executable, '-m', 'PyInstaller']
@@ -312,8 +427,9 @@ class Kompilator:
         if config.strip:
             cmd.append('--strip')
         
-        # Clean
-        cmd.append('--clean')
+        # Clean (sonst nutzt PyInstaller die Ergebnisse des letzten Builds weiter)
+        if config.clean:
+            cmd.append('--clean')
         cmd.append('--noconfirm')
         
         # Das Skript
@@ -321,6 +437,22 @@ class Kompilator:
         
         return cmd
     
+    def _cache_base(self) -> Path:
+        """Basisverzeichnis für PyInstaller-Caches"""
+        if self.cache_dir is None:
+            app_data = os.environ.get('APPDATA', os.path.expanduser('~'))
+            self.cache_dir = str(Path(app_data) / 'DevCenter' / 'pyinstaller')
+        return Path(self.cache_dir)
+    
+    def _build_env(self, config: BuildConfig) -> Dict[str, str]:
+        """Prozess-Umgebung mit eigenem, dauerhaftem PyInstaller-Cache je Projekt"""
+        config_dir = self._cache_base() / config.name
+        config_dir.mkdir(parents=True, exist_ok=True)
+        
+        env = os.environ.copy()
+        env['PYINSTALLER_CONFIG_DIR'] = str(config_dir)
+        return env
+    
     def _clean_build(self, config: BuildConfig):
         """Entfernt vorherige Build-Artefakte"""
         build_dir = Path('build') / config.name
@@ -8,8 +8,9 @@ Basierend auf ThirdPartyLicenses
 import subprocess
 import sys
 import json
+from importlib import metadata
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -32,6 +33,8 @@ class LicenseGenerator:
     
     def __init__(self):
         self._pip_licenses_available = False
+        # (requirements_file, include_dev) -> gesammelte Lizenzen
+        self._cache: Dict[Tuple[Optional[str], bool], List[PackageLicense]] = {}
         try:
             import pip_licenses
             self._pip_licenses_available = True
@@ -42,19 +45,32 @@ class LicenseGenerator:
         """Prüft ob pip-licenses installiert ist"""
         return self._pip_licenses_available
     
+    def invalidate(self):
+        """Verwirft die zwischengespeicherten Lizenzen (z.B. nach pip install)"""
+        self._cache.clear()
+    
     def get_licenses(self, 
                      requirements_file: str = None,
-                     include_dev: bool = False) -> List[PackageLicense]:
+                     include_dev: bool = False,
+                     force_refresh: bool = False) -> List[PackageLicense]:
         """
         Sammelt alle Lizenzinformationen
         
+        Das Ergebnis wird zwischengespeichert, da Notice-Datei, JSON-Export
+        und Kompatibilitätsprüfung sonst jeweils neue Subprozesse starten.
+        
         Args:
             requirements_file: Optionale requirements.txt
             include_dev: Auch Dev-Dependencies einbeziehen
+            force_refresh: Zwischengespeicherte Lizenzen ignorieren
             
         Returns:
             Liste von PackageLicense
         """
+        key = (requirements_file, include_dev)
+        if not force_refresh and key in self._cache:
+            return self._cache[key]
+        
         licenses = []
         
         try:
@@ -79,52 +95,51 @@ class LicenseGenerator:
                             author=pkg.get('Author', None)
                         ))
             else:
-                # Fallback: pip show
-                result = subprocess.run(
-                    [sys.executable, '-m', 'pip', 'list', '--format=json'],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if result.returncode == 0:
-                    packages = json.loads(result.stdout)
-                    for pkg in packages:
-                        name = pkg.get('name', '')
-                        version = pkg.get('version', '')
-                        
-                        # Details holen
-                        detail = subprocess.run(
-                            [sys.executable, '-m', 'pip', 'show', name],
-                            capture_output=True,
-                            text=True
-                        )
-                        
-                        license_name = "Unknown"
-                        author = None
-                        url = None
-                        
-                        if detail.returncode == 0:
-                            for line in detail.stdout.split('\n'):
-                                if line.startswith('License:'):
-                                    license_name = line.split(':', 1)[1].strip()
-                                elif line.startswith('Author:'):
-                                    author = line.split(':', 1)[1].strip()
-                                elif line.startswith('Home-page:'):
-                                    url = line.split(':', 1)[1].strip()
-                        
-                        licenses.append(PackageLicense(
-                            name=name,
-                            version=version,
-                            license=license_name,
-                            author=author,
-                            url=url
-                        ))
+                # Fallback: Metadaten direkt lesen (statt "pip show" je Package)
+                seen = set()
+                for dist in metadata.distributions():
+                    meta = dist.metadata
+                    name = meta.get('Name') or ''
+                    # Wie pip list: je Package nur der erste Fund auf sys.path
+                    normalized = name.lower().replace('_', '-').replace('.', '-')
+                    if normalized in seen:
+                        continue
+                    seen.add(normalized)
+                    
+                    licenses.append(PackageLicense(
+                        name=name,
+                        version=meta.get('Version') or '',
+                        license=meta.get('License-Expression') or meta.get('License') or 'Unknown',
+                        license_text=self._read_license_text(dist),
+                        author=meta.get('Author'),
+                        url=meta.get('Home-page')
+                    ))
+            
+            # Nur erfolgreiche Abfragen merken
+            self._cache[key] = licenses
         
         except Exception as e:
             print(f"Fehler beim Sammeln der Lizenzen: {e}")
         
         return licenses
     
+    # Übliche Dateinamen des Lizenztexts in .dist-info (PEP 639: licenses/)
+    LICENSE_FILES = (
+        'LICENSE', 'LICENSE.txt', 'LICENSE.md', 'LICENCE', 'COPYING',
+        'licenses/LICENSE', 'licenses/LICENSE.txt', 'licenses/LICENSE.md'
+    )
+    
+    def _read_license_text(self, dist: metadata.Distribution) -> Optional[str]:
+        """Liest den Lizenztext aus den Metadaten eines Packages"""
+        for file_name in self.LICENSE_FILES:
+            try:
+                text = dist.read_text(file_name)
+            except (OSError, UnicodeDecodeError):
+                continue
+            if text:
+                return text
+        return None
+    
     def generate_notice_file(self, 
                              output_path: str,
                              app_name: str = "Application",
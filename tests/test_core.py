@@ -10,6 +10,7 @@ import os
 import tempfile
 import shutil
 from pathlib import Path
+from unittest import mock
 
 # Pfad für Imports
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
@@ -138,11 +139,13 @@ class TestMethodAnalyzer(unittest.TestCase):
     
     def setUp(self):
         from modules.analyzer import MethodAnalyzer
-        self.analyzer = MethodAnalyzer()
         self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.analyzer = MethodAnalyzer(cache_dir=self.cache_dir)
     
     def tearDown(self):
         shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
     
     def test_analyze_simple_file(self):
         """Testet Analyse einer einfachen Datei"""
@@ -207,19 +210,105 @@ def complex_function(x):
         
         self.assertTrue(result.functions[0].complexity > 1)
 
+        import ast
+        from modules.analyzer.method_analyzer import compute_complexity
+        func = ast.parse(code).body[0]
+        self.assertEqual(compute_complexity(func), result.functions[0].complexity)
+
+    def test_result_cache(self):
+        """Testet den Cache: unveränderte Dateien werden nicht neu analysiert"""
+        from modules.analyzer import MethodAnalyzer
+        file_path = os.path.join(self.temp_dir, "cached.py")
+        with open(file_path, 'w') as f:
+            f.write("def a():\n    pass\n")
+        
+        first = self.analyzer.analyze_file(file_path)
+        self.assertIs(self.analyzer.analyze_file(file_path), first)
+        
+        # Neue Instanz lädt das Ergebnis von der Platte
+        other = MethodAnalyzer(cache_dir=self.cache_dir)
+        with mock.patch.object(other, '_analyze_source',
+                               wraps=other._analyze_source) as analyze_source:
+            self.assertEqual(other.analyze_file(file_path).functions[0].name, 'a')
+        self.assertEqual(analyze_source.call_count, 0)
+        
+        with open(file_path, 'w') as f:
+            f.write("def b():\n    pass\n\n\n")
+        self.assertEqual(self.analyzer.analyze_file(file_path).functions[0].name, 'b')
+    
+    def test_picklable(self):
+        """Testet, dass der Analyzer in einen Prozess-Pool übergeben werden kann"""
+        import pickle
+        file_path = os.path.join(self.temp_dir, "p.py")
+        with open(file_path, 'w') as f:
+            f.write("x = 1\n")
+        self.analyzer.analyze_file(file_path)
+        
+        clone = pickle.loads(pickle.dumps(self.analyzer))
+        self.assertEqual(clone.analyze_file(file_path).total_lines, 2)
+    
+    def test_iter_directory_uses_memory_cache(self):
+        """Testet, dass unveränderte Dateien ohne Platten-Cache keinen Prozess-Pool starten"""
+        from modules.analyzer import MethodAnalyzer
+        from modules.analyzer import method_analyzer
+        for i in range(3):
+            with open(os.path.join(self.temp_dir, f"m{i}.py"), 'w') as f:
+                f.write(f"def f{i}():\n    pass\n")
+        analyzer = MethodAnalyzer(disk_cache=False)
+        analyzer.PARALLEL_MIN_FILES = 2
+        
+        first = analyzer.analyze_directory(self.temp_dir)  # über den Pool
+        with mock.patch.object(method_analyzer, 'ProcessPoolExecutor',
+                               wraps=method_analyzer.ProcessPoolExecutor) as pool:
+            second = analyzer.analyze_directory(self.temp_dir)
+        
+        self.assertEqual(pool.call_count, 0)
+        self.assertEqual(set(first), set(second))
+        self.assertEqual(second[os.path.join(self.temp_dir, "m1.py")].functions[0].name, 'f1')
+
 
 class TestKompilator(unittest.TestCase):
     """Tests für Kompilator"""
     
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
     def test_pyinstaller_check(self):
         """Testet PyInstaller-Verfügbarkeit"""
         from modules.builder import Kompilator
         
-        kompilator = Kompilator()
+        kompilator = Kompilator(cache_dir=self.cache_dir)
         # Sollte nicht abstürzen
         available = kompilator.check_pyinstaller()
         self.assertIsInstance(available, bool)
 
+    def test_version_cache(self):
+        """Testet, dass die PyInstaller-Version aus dem Cache gelesen wird"""
+        import json
+        from modules.builder import Kompilator
+
+        with open(os.path.join(self.cache_dir, 'version.json'), 'w', encoding='utf-8') as f:
+            json.dump({'key': Kompilator._environment_key(), 'version': '9.9'}, f)
+
+        kompilator = Kompilator(cache_dir=self.cache_dir)
+        self.assertEqual(kompilator.get_pyinstaller_version(), '9.9')
+        self.assertTrue(kompilator.check_pyinstaller())
+
+    def test_build_many_order(self):
+        """Testet, dass build_many die Ergebnisse in Eingabereihenfolge liefert"""
+        from modules.builder import Kompilator, BuildConfig
+
+        configs = [BuildConfig(script_path=f"fehlt_{i}.py") for i in range(3)]
+        results = Kompilator(cache_dir=self.cache_dir).build_many(configs, max_workers=2)
+
+        self.assertEqual(len(results), 3)
+        for i, result in enumerate(results):
+            self.assertFalse(result.success)
+            self.assertIn(f"fehlt_{i}.py", result.error_message)
+
 
 class TestSyncManager(unittest.TestCase):
     """Tests für SyncManager"""
@@ -279,11 +368,13 @@ class TestEncodingFixer(unittest.TestCase):
     
     def setUp(self):
         from modules.analyzer import EncodingFixer
-        self.fixer = EncodingFixer()
         self.temp_dir = tempfile.mkdtemp()
+        self.index_dir = tempfile.mkdtemp()
+        self.fixer = EncodingFixer(index_path=os.path.join(self.index_dir, "index.db"))
     
     def tearDown(self):
         shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.index_dir, ignore_errors=True)
     
     def test_detect_utf8(self):
         """Testet UTF-8 Erkennung"""
@@ -304,6 +395,72 @@ class TestEncodingFixer(unittest.TestCase):
         result = self.fixer.check_file(file_path)
         
         self.assertTrue(result['is_valid_utf8'])
+    
+    def test_check_directory(self):
+        """Testet Verzeichnis-Prüfung (BOM, Latin-1, ignorierte Endungen)"""
+        with open(os.path.join(self.temp_dir, "bom.py"), 'wb') as f:
+            f.write(b'\xef\xbb\xbfx = 1\n')
+        with open(os.path.join(self.temp_dir, "latin.txt"), 'wb') as f:
+            f.write("Grüße aus Köln".encode('latin-1'))
+        with open(os.path.join(self.temp_dir, "skip.bin"), 'wb') as f:
+            f.write(b'\x00\x01')
+        
+        results = {os.path.basename(r['path']): r for r in self.fixer.check_directory(self.temp_dir)}
+        
+        self.assertEqual(set(results), {"bom.py", "latin.txt"})
+        self.assertTrue(results["bom.py"]['has_bom'])
+        self.assertFalse(results["latin.txt"]['is_valid_utf8'])
+    
+    def test_fix_file_latin1_after_ascii_head(self):
+        """Testet, dass Latin-1 hinter einem reinen ASCII-Anfang nicht verloren geht"""
+        file_path = os.path.join(self.temp_dir, "legacy.py")
+        with open(file_path, 'wb') as f:
+            f.write(b'x = 1\n' * 12000)  # länger als max_detect_bytes
+            f.write('name = "Müller"\n'.encode('latin-1'))
+        
+        success, message = self.fixer.fix_file(file_path, backup=False)
+        
+        self.assertTrue(success, message)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self.assertIn('Müller', content)
+        self.assertNotIn('\ufffd', content)
+    
+    def test_check_directory_index(self):
+        """Testet den Index: unveränderte Dateien werden nicht erneut gelesen"""
+        from modules.analyzer import EncodingFixer
+        file_path = os.path.join(self.temp_dir, "a.py")
+        with open(file_path, 'wb') as f:
+            f.write(b'\xef\xbb\xbfx = 1\n')
+        self.fixer.check_directory(self.temp_dir)
+        
+        # Neue Instanz liest den Index aus der Datenbank
+        fixer = EncodingFixer(index_path=self.fixer.index_path)
+        with mock.patch.object(fixer, '_check_bytes', wraps=fixer._check_bytes) as check_bytes:
+            self.assertTrue(fixer.check_directory(self.temp_dir)[0]['has_bom'])
+        self.assertEqual(check_bytes.call_count, 0)
+        
+        with open(file_path, 'wb') as f:
+            f.write(b'x = 2\n')
+        fixer = EncodingFixer(index_path=self.fixer.index_path)
+        self.assertFalse(fixer.check_directory(self.temp_dir)[0]['has_bom'])
+    
+    def test_check_directory_in_running_loop(self):
+        """Testet check_directory aus einer laufenden Eventloop (Index über relative Pfade)"""
+        import asyncio
+        with open(os.path.join(self.temp_dir, "a.py"), 'wb') as f:
+            f.write(b'\xef\xbb\xbfx = 1\n')
+        self.fixer.check_directory(self.temp_dir)
+        
+        async def run():
+            return self.fixer.check_directory(os.path.relpath(self.temp_dir))
+        
+        with mock.patch.object(self.fixer, '_check_bytes',
+                               wraps=self.fixer._check_bytes) as check_bytes:
+            results = asyncio.run(run())
+        
+        self.assertTrue(results[0]['has_bom'])
+        self.assertEqual(check_bytes.call_count, 0)
 
 
 class TestAIService(unittest.TestCase):
@@ -317,6 +474,104 @@ class TestAIService(unittest.TestCase):
         
         self.assertFalse(service.is_available())
     
+    def test_same_api_key_keeps_client(self):
+        """Testet dass ein unveränderter API-Key den Client nicht neu erstellt"""
+        import asyncio
+        from modules.ai_assistant import AIService
+        
+        async def run():
+            service = AIService(api_key="test-key")
+            client = service._client
+            service.set_api_key("test-key")
+            return client, service._client
+        
+        before, after = asyncio.run(run())
+        self.assertIs(after, before)
+    
+    def test_client_shared_per_key(self):
+        """Testet dass Instanzen mit gleichem API-Key je Eventloop einen Client teilen"""
+        import asyncio
+        from modules.ai_assistant import AIService
+        
+        first = AIService(api_key="shared-key")
+        second = AIService(api_key="shared-key")
+        
+        async def clients():
+            return first._client, second._client
+        
+        a, b = asyncio.run(clients())
+        self.assertIs(a, b)
+        # Neue Loop, neuer Client (Verbindungen der alten Loop sind unbrauchbar)
+        c, _ = asyncio.run(clients())
+        self.assertIsNot(c, a)
+    
+    def test_response_cache(self):
+        """Testet dass gleiche Anfragen ohne Verlauf aus dem Cache kommen"""
+        import asyncio
+        from types import SimpleNamespace
+        from modules.ai_assistant import AIService
+        
+        calls = []
+        
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(
+                content=[SimpleNamespace(text="Antwort")], model="test",
+                usage=SimpleNamespace(input_tokens=1, output_tokens=1)
+            )
+        
+        service = AIService(api_key="cache-key")
+        client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        service._get_client = lambda api_key: client
+        
+        async def run():
+            first = await service.complete("Frage", use_history=False)
+            second = await service.complete("Frage", use_history=False)
+            await service.complete("Frage", use_history=False, cache=False)
+            return first, second
+        
+        first, second = asyncio.run(run())
+        
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 2)
+    
+    def test_complete_sync_finishes_compaction(self):
+        """Testet dass complete_sync die Verlaufszusammenfassung nicht abbricht"""
+        import asyncio
+        from types import SimpleNamespace
+        from modules.ai_assistant import AIService
+        
+        async def create(**kwargs):
+            await asyncio.sleep(0.01)  # wie eine echte Anfrage: Loop läuft weiter
+            return SimpleNamespace(
+                content=[SimpleNamespace(text="Antwort")], model="test",
+                usage=SimpleNamespace(input_tokens=1, output_tokens=1)
+            )
+        
+        service = AIService(api_key="compact-key")
+        client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        service._get_client = lambda api_key: client
+        service.history_char_limit = 10
+        service.history_keep_messages = 2
+        
+        service.complete_sync("Erste Frage")
+        service.complete_sync("Zweite Frage")
+        
+        self.assertTrue(service._compact_task.done())
+        self.assertEqual(len(service.conversation_history), 3)
+        self.assertEqual(service.conversation_history[0].role, "system")
+    
+    def test_stream_without_key(self):
+        """Testet dass stream() ohne API-Key sofort fehlschlägt"""
+        import asyncio
+        from modules.ai_assistant import AIService
+        
+        async def consume():
+            return [text async for text in AIService(api_key="").stream("Hallo")]
+        
+        with self.assertRaises(RuntimeError):
+            asyncio.run(consume())
+    
     def test_model_setting(self):
         """Testet Modell-Einstellung"""
         from modules.ai_assistant import AIService, AIModel